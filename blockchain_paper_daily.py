@@ -1,14 +1,34 @@
 # blockchain_paper_daily.py
 
-import arxiv
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import re
+import bisect
 import requests
 import json
 import os
-from typing import List, Dict, Optional
+import sys
+import threading
+import zlib
+import contextlib
+import cProfile
+import pstats
+import tracemalloc
+import hashlib
+import html
+import tempfile
+from email.utils import format_datetime
+from urllib.parse import quote, urlencode
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Optional, Tuple
 import random  # 添加随机数导入
+from concurrent.futures import ThreadPoolExecutor
+
+# numpy 为可选依赖，仅用于往期论文的语义索引（"往期相关推荐"）
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # 默认配置值
 DEFAULT_MODEL_NAME = "qwen-plus"
@@ -54,6 +74,12 @@ except ImportError:
     MAX_RESULTS_PER_CATEGORY = os.environ.get("MAX_RESULTS_PER_CATEGORY", DEFAULT_MAX_RESULTS_PER_CATEGORY)
     DAYS_TO_LOOK_BACK = os.environ.get("DAYS_TO_LOOK_BACK", DEFAULT_DAYS_TO_LOOK_BACK)
 
+# 多频道配置（可选）：未配置时只运行一个与上方参数一致的默认频道
+try:
+    from config import CHANNELS
+except ImportError:
+    CHANNELS = []
+
 # -------------------------------
 # 配置区域
 # -------------------------------
@@ -62,42 +88,271 @@ except ImportError:
 
 # 2. 设置搜索参数 (已从config.py或环境变量导入)
 
-# 3. CCF-A类区块链相关会议和期刊列表
-CCF_A_VENUES = [
-    # 网络与信息安全领域
-    'CCS',           # ACM Conference on Computer and Communications Security
-    'CRYPTO',        # International Association for Cryptologic Research
-    'EUROCRYPT',     # European Cryptologic Conference
-    'S&P',           # IEEE Symposium on Security and Privacy
-    'USENIX Security', # USENIX Security Symposium
-    
-    # 计算机体系结构/高性能计算/存储系统领域
-    'ASPLOS',        # ACM International Conference on Architectural Support for Programming Languages and Operating Systems
-    'ISCA',          # ACM/IEEE International Symposium on Computer Architecture
-    'MICRO',         # IEEE/ACM International Symposium on Microarchitecture
-    'HPCA',          # IEEE International Symposium on High-Performance Computer Architecture
-    
-    # 计算机网络领域
-    'SIGCOMM',       # ACM International Conference on Applications, Technologies, Architectures, and Protocols for Computer Communication
-    'NSDI',          # USENIX Symposium on Networked Systems Design and Implementation
-    
-    # 数据库/数据挖掘/内容检索领域
-    'SIGMOD',        # ACM International Conference on Management of Data
-    'VLDB',          # International Conference on Very Large Data Bases
-    'ICDE',          # IEEE International Conference on Data Engineering
-    
-    # 软件工程/系统软件/程序设计语言领域
-    'ICSE',          # International Conference on Software Engineering
-    'ESEC/FSE',      # European Software Engineering Conference / Foundations of Software Engineering
-    'ASE',           # International Conference on Automated Software Engineering
-    'ISSTA',         # International Symposium on Software Testing and Analysis
-    
-    # 人工智能领域
-    'AAAI',          # Association for the Advancement of Artificial Intelligence
-    'IJCAI',         # International Joint Conference on Artificial Intelligence
-    'ICML',          # International Conference on Machine Learning
-    'NeurIPS',       # Conference on Neural Information Processing Systems
-]
+# 3. CCF 推荐会议/期刊目录（按 A/B/C 分级）
+# 仅收录与本项目方向相关的部分会议/期刊，并非完整的 CCF 目录；未收录的 venue 按无等级处理
+# 键为规范名称，值为别名列表；不含空格的全大写缩写按大小写敏感、词边界匹配
+CCF_VENUE_CATALOG = {
+    'A': {
+        # 网络与信息安全领域
+        'CCS': ['ACM CCS', 'Conference on Computer and Communications Security'],
+        'CRYPTO': ['International Cryptology Conference'],
+        'EUROCRYPT': ['EuroCrypt'],
+        'S&P': ['IEEE S&P', 'Oakland', 'IEEE Symposium on Security and Privacy'],
+        'USENIX Security': ['USENIX Sec', 'USENIX Security Symposium'],
+        'NDSS': ['Network and Distributed System Security Symposium'],
+        'TDSC': ['IEEE Transactions on Dependable and Secure Computing'],
+        'TIFS': ['IEEE Transactions on Information Forensics and Security'],
+        'JoC': ['Journal of Cryptology'],
+
+        # 计算机体系结构/并行与分布计算/存储系统领域
+        'ASPLOS': ['Architectural Support for Programming Languages and Operating Systems'],
+        'ISCA': ['International Symposium on Computer Architecture'],
+        'MICRO': ['International Symposium on Microarchitecture'],
+        'HPCA': ['High-Performance Computer Architecture'],
+        'PPoPP': ['Principles and Practice of Parallel Programming'],
+        'FAST': ['USENIX FAST', 'Conference on File and Storage Technologies'],
+        'DAC': ['Design Automation Conference'],
+        'SC': ['Supercomputing Conference', 'International Conference for High Performance Computing, Networking, Storage and Analysis'],
+        'USENIX ATC': ['USENIX Annual Technical Conference'],
+        'EuroSys': ['European Conference on Computer Systems'],
+        'TPDS': ['IEEE Transactions on Parallel and Distributed Systems'],
+        'TC': ['IEEE Transactions on Computers'],
+        'TOCS': ['ACM Transactions on Computer Systems'],
+
+        # 计算机网络领域
+        'SIGCOMM': ['ACM SIGCOMM'],
+        'MobiCom': ['International Conference on Mobile Computing and Networking'],
+        'INFOCOM': ['IEEE INFOCOM'],
+        'NSDI': ['Networked Systems Design and Implementation'],
+        'JSAC': ['IEEE Journal on Selected Areas in Communications'],
+        'TMC': ['IEEE Transactions on Mobile Computing'],
+        'TON': ['IEEE/ACM Transactions on Networking'],
+
+        # 数据库/数据挖掘/内容检索领域
+        'SIGMOD': ['ACM SIGMOD', 'International Conference on Management of Data'],
+        'SIGKDD': ['KDD', 'Knowledge Discovery and Data Mining'],
+        'ICDE': ['International Conference on Data Engineering'],
+        'SIGIR': ['ACM SIGIR'],
+        'VLDB': ['PVLDB', 'Proc. VLDB Endow', 'Proceedings of the VLDB Endowment', 'VLDB Journal'],
+        'TKDE': ['IEEE Transactions on Knowledge and Data Engineering'],
+        'TODS': ['ACM Transactions on Database Systems'],
+
+        # 软件工程/系统软件/程序设计语言领域
+        'ICSE': ['International Conference on Software Engineering'],
+        'ESEC/FSE': ['FSE', 'ESEC-FSE', 'ACM FSE', 'Foundations of Software Engineering'],
+        'ASE': ['Automated Software Engineering'],
+        'ISSTA': ['International Symposium on Software Testing and Analysis'],
+        'PLDI': ['Programming Language Design and Implementation'],
+        'POPL': ['Principles of Programming Languages'],
+        'OOPSLA': ['SPLASH/OOPSLA'],
+        'SOSP': ['Symposium on Operating Systems Principles'],
+        'OSDI': ['Operating Systems Design and Implementation'],
+        'TSE': ['IEEE Transactions on Software Engineering'],
+        'TOSEM': ['ACM Transactions on Software Engineering and Methodology'],
+        'TSC': ['IEEE Transactions on Services Computing'],
+
+        # 人工智能领域
+        'AAAI': ['AAAI Conference on Artificial Intelligence'],
+        'IJCAI': ['International Joint Conference on Artificial Intelligence'],
+        'ICML': ['International Conference on Machine Learning'],
+        'NeurIPS': ['NIPS', 'Neural Information Processing Systems'],
+        'ACL': ['Annual Meeting of the Association for Computational Linguistics'],
+        'CVPR': ['Computer Vision and Pattern Recognition'],
+        'ICCV': ['International Conference on Computer Vision'],
+
+        # 计算机科学理论领域
+        'STOC': ['Symposium on Theory of Computing'],
+        'FOCS': ['Foundations of Computer Science'],
+        'SODA': ['Symposium on Discrete Algorithms'],
+        'CAV': ['Computer Aided Verification'],
+        'LICS': ['Logic in Computer Science'],
+
+        # 交叉/综合/新兴领域
+        'WWW': ['The Web Conference', 'TheWebConf'],
+        'RTSS': ['Real-Time Systems Symposium'],
+    },
+    'B': {
+        # 网络与信息安全领域
+        'ACSAC': ['Annual Computer Security Applications Conference'],
+        'ASIACRYPT': ['AsiaCrypt'],
+        'ESORICS': ['European Symposium on Research in Computer Security'],
+        'Fast Software Encryption': [],
+        'CSF': ['CSFW', 'Computer Security Foundations'],
+        'SRDS': ['Symposium on Reliable Distributed Systems'],
+        'CHES': ['Cryptographic Hardware and Embedded Systems'],
+        'DSN': ['Dependable Systems and Networks'],
+        'RAID': ['Research in Attacks, Intrusions and Defenses'],
+        'PKC': ['Public-Key Cryptography'],
+        'TCC': ['Theory of Cryptography Conference'],
+        'TOPS': ['ACM Transactions on Privacy and Security'],
+        'Computers & Security': [],
+        'JCS': ['Journal of Computer Security'],
+        'DCC': ['Designs, Codes and Cryptography'],
+
+        # 计算机体系结构/并行与分布计算/存储系统领域
+        'PODC': ['Principles of Distributed Computing'],
+        'SPAA': ['Symposium on Parallelism in Algorithms and Architectures'],
+        'SoCC': ['ACM Symposium on Cloud Computing'],
+        'ICDCS': ['International Conference on Distributed Computing Systems'],
+        'IPDPS': ['International Parallel and Distributed Processing Symposium'],
+        'ICPP': ['International Conference on Parallel Processing'],
+        'HPDC': ['High-Performance Parallel and Distributed Computing'],
+        'SIGMETRICS': ['ACM SIGMETRICS'],
+        'CLUSTER': ['IEEE Cluster'],
+        'Euro-Par': ['EuroPar'],
+        'DATE': ['Design, Automation and Test in Europe'],
+        'ICCAD': ['International Conference on Computer-Aided Design'],
+        'JPDC': ['Journal of Parallel and Distributed Computing'],
+
+        # 计算机网络领域
+        'CoNEXT': ['Emerging Networking Experiments and Technologies'],
+        'MobiSys': ['Mobile Systems, Applications, and Services'],
+        'SenSys': ['Embedded Networked Sensor Systems'],
+        'ICNP': ['International Conference on Network Protocols'],
+        'MobiHoc': ['ACM MobiHoc'],
+        'IWQoS': ['International Symposium on Quality of Service'],
+        'IMC': ['Internet Measurement Conference'],
+        'SECON': ['IEEE SECON'],
+        'IPSN': ['Information Processing in Sensor Networks'],
+        'Computer Networks': [],
+        'Computer Communications': [],
+        'TOIT': ['ACM Transactions on Internet Technology'],
+        'TNSM': ['IEEE Transactions on Network and Service Management'],
+        'TWEB': ['ACM Transactions on the Web'],
+
+        # 数据库/数据挖掘/内容检索领域
+        'CIKM': ['Conference on Information and Knowledge Management'],
+        'WSDM': ['Web Search and Data Mining'],
+        'PODS': ['Principles of Database Systems'],
+        'DASFAA': ['Database Systems for Advanced Applications'],
+        'ICDM': ['IEEE International Conference on Data Mining'],
+        'EDBT': ['Extending Database Technology'],
+        'ICDT': ['International Conference on Database Theory'],
+        'CIDR': ['Conference on Innovative Data Systems Research'],
+
+        # 软件工程/系统软件/程序设计语言领域
+        'ECOOP': ['European Conference on Object-Oriented Programming'],
+        'ETAPS': ['European Joint Conferences on Theory and Practice of Software'],
+        'ICSME': ['International Conference on Software Maintenance and Evolution'],
+        'SANER': ['Software Analysis, Evolution and Reengineering'],
+        'ICPC': ['International Conference on Program Comprehension'],
+        'ISSRE': ['Software Reliability Engineering'],
+        'Middleware': ['ACM/IFIP Middleware'],
+        'ICWS': ['International Conference on Web Services'],
+        'ICSOC': ['International Conference on Service-Oriented Computing'],
+        'ESEM': ['Empirical Software Engineering and Measurement'],
+        'HotOS': ['Hot Topics in Operating Systems'],
+
+        # 人工智能领域
+        'EMNLP': ['Empirical Methods in Natural Language Processing'],
+        'ECCV': ['European Conference on Computer Vision'],
+        'ECAI': ['European Conference on Artificial Intelligence'],
+        'AAMAS': ['Autonomous Agents and Multiagent Systems'],
+        'UAI': ['Uncertainty in Artificial Intelligence'],
+        'COLT': ['Conference on Learning Theory'],
+        'NAACL': ['North American Chapter of the Association for Computational Linguistics'],
+        'ICRA': ['International Conference on Robotics and Automation'],
+
+        # 计算机科学理论领域
+        'ICALP': ['International Colloquium on Automata, Languages and Programming'],
+        'ESA': ['European Symposium on Algorithms'],
+        'CONCUR': ['International Conference on Concurrency Theory'],
+
+        # 交叉/综合/新兴领域
+        'JSS': ['Journal of Systems and Software'],
+        'Information Sciences': [],
+    },
+    'C': {
+        # 网络与信息安全领域
+        'FC': ['Financial Cryptography', 'Financial Cryptography and Data Security'],
+        'AsiaCCS': ['ASIACCS', 'ASIA CCS', 'Asia-CCS'],
+        'EuroS&P': ['Euro S&P', 'IEEE European Symposium on Security and Privacy'],
+        'ACNS': ['Applied Cryptography and Network Security'],
+        'CT-RSA': ['RSA Conference Cryptographers'],
+        'PETS': ['PoPETs', 'Privacy Enhancing Technologies'],
+        'ACISP': ['Australasian Conference on Information Security and Privacy'],
+        'DIMVA': ['Detection of Intrusions and Malware'],
+        'SecureComm': ['Security and Privacy in Communication Networks'],
+        'ICICS': ['International Conference on Information and Communications Security'],
+        'TrustCom': ['IEEE TrustCom'],
+        'WiSec': ['Security and Privacy in Wireless and Mobile Networks'],
+        'SACMAT': ['Access Control Models and Technologies'],
+        'Inscrypt': ['Information Security and Cryptology'],
+        'IET Information Security': [],
+        'Security and Communication Networks': [],
+
+        # 计算机体系结构/并行与分布计算/存储系统领域
+        'CCGRID': ['CCGrid', 'Cluster, Cloud and Internet Computing'],
+        'HPCC': ['High Performance Computing and Communications'],
+        'ICPADS': ['International Conference on Parallel and Distributed Systems'],
+        'ICA3PP': ['Algorithms and Architectures for Parallel Processing'],
+        'ISPA': ['Parallel and Distributed Processing with Applications'],
+        'MASCOTS': ['Modeling, Analysis, and Simulation of Computer and Telecommunication Systems'],
+        'ASP-DAC': ['Asia and South Pacific Design Automation Conference'],
+        'FGCS': ['Future Generation Computer Systems'],
+        'TJSC': ['The Journal of Supercomputing', 'Journal of Supercomputing'],
+        'Cluster Computing': [],
+
+        # 计算机网络领域
+        'GLOBECOM': ['IEEE Global Communications Conference', 'Globecom'],
+        'ICC': ['IEEE International Conference on Communications'],
+        'WCNC': ['Wireless Communications and Networking Conference'],
+        'LCN': ['Local Computer Networks'],
+        'ICCCN': ['Computer Communications and Networks'],
+        'MASS': ['Mobile Ad-Hoc and Smart Systems'],
+        'ISCC': ['IEEE Symposium on Computers and Communications'],
+        'P2P': ['Peer-to-Peer Computing'],
+        'HotNets': ['Hot Topics in Networks'],
+        'MSN': ['Mobility, Sensing and Networking'],
+        'IoT-J': ['IEEE Internet of Things Journal'],
+        'PPNA': ['Peer-to-Peer Networking and Applications'],
+        'JNCA': ['Journal of Network and Computer Applications'],
+        'Ad Hoc Networks': [],
+
+        # 数据库/数据挖掘/内容检索领域
+        'PAKDD': ['Pacific-Asia Conference on Knowledge Discovery and Data Mining'],
+        'DEXA': ['Database and Expert Systems Applications'],
+        'WISE': ['Web Information Systems Engineering'],
+        'APWeb': ['APWeb-WAIM'],
+        'ECIR': ['European Conference on Information Retrieval'],
+        'SSDBM': ['Scientific and Statistical Database Management'],
+
+        # 软件工程/系统软件/程序设计语言领域
+        'MSR': ['Mining Software Repositories'],
+        'ICST': ['Software Testing, Verification and Validation'],
+        'APSEC': ['Asia-Pacific Software Engineering Conference'],
+        'COMPSAC': ['Computers, Software, and Applications Conference'],
+        'QRS': ['Software Quality, Reliability and Security'],
+        'SCAM': ['Source Code Analysis and Manipulation'],
+        'APLAS': ['Asian Symposium on Programming Languages and Systems'],
+        'EASE': ['Evaluation and Assessment in Software Engineering'],
+        'SEKE': ['Software Engineering and Knowledge Engineering'],
+        'Internetware': ['Asia-Pacific Symposium on Internetware'],
+
+        # 人工智能领域
+        'AISTATS': ['Artificial Intelligence and Statistics'],
+        'ICTAI': ['Tools with Artificial Intelligence'],
+        'IJCNN': ['International Joint Conference on Neural Networks'],
+        'PRICAI': ['Pacific Rim International Conference on Artificial Intelligence'],
+        'ICONIP': ['International Conference on Neural Information Processing'],
+        'ICPR': ['International Conference on Pattern Recognition'],
+
+        # 计算机科学理论领域
+        'STACS': ['Theoretical Aspects of Computer Science'],
+        'ISAAC': ['International Symposium on Algorithms and Computation'],
+        'MFCS': ['Mathematical Foundations of Computer Science'],
+    },
+}
+
+# 兼容旧接口：CCF-A 类会议/期刊规范名称列表
+CCF_A_VENUES = list(CCF_VENUE_CATALOG['A'])
+
+# 同时也是常见技术缩写或英文单词的会议名称：只有后接年份/Conference 等字样，
+# 或前面是 IEEE/ACM/IFIP 时才视为会议（如 'P2P 2019'、'IEEE P2P'，而不是 'P2P overlay'）
+CCF_AMBIGUOUS_ACRONYMS = {
+    'P2P', 'SC', 'TC', 'FC', 'WWW', 'MSN', 'PKC', 'IMC', 'DAC', 'ESA', 'TON', 'ICC', 'PETS', 'CAV',
+    'FAST', 'DATE', 'CLUSTER', 'MICRO', 'MASS', 'WISE', 'EASE', 'SCAM',
+}
 
 # 4. 模型配置 (已从config.py或环境变量导入)
 
@@ -105,22 +360,768 @@ CCF_A_VENUES = [
 
 # 6. 定时任务配置 (已从config.py或环境变量导入)
 
+# 7. 历史记录、小红书内容与回填日报输出
+HISTORY_FILENAME = "paper_history.md"
+SEARCH_RESULTS_DIR = "arxiv_search_results"
+PAPER_INDEX_DIR = "paper_index"
+PAPER_INDEX_DIM = 1024
+RELATED_PAPER_COUNT = 3
+# 往期相关推荐的最低余弦相似度：1024 维下互不相关的摘要在 10 万篇规模的索引中最高约 0.26，
+# 低于该阈值的结果不视为相关，宁可不列出也不凑满 RELATED_PAPER_COUNT 篇
+RELATED_PAPER_MIN_SCORE = 0.3
+XIAOHONGSHU_FILENAME = "xiaohongshu_post.md"
+XIAOHONGSHU_COVER_FILENAME = "xiaohongshu_cover.txt"
+BACKFILL_DIR = "backfill_reports"
+BACKFILL_WORKERS = 4
+
+# 8. 话题词表：小红书话题标签（按优先级排列）
+HASHTAG_TOPICS = {
+    '区块链': ['blockchain', '区块链'],
+    '共识机制': ['consensus', '共识', 'bft', 'pbft', '拜占庭'],
+    '智能合约': ['smart contract', '智能合约', 'solidity'],
+    '网络安全': ['security', 'attack', '安全', '攻击', '防护'],
+    '隐私保护': ['privacy', 'private', 'zk', 'zkp', 'zk-snark', 'zksnark', 'zero-knowledge', '匿名', '零知识'],
+    '性能优化': ['performance', 'scalability', 'sharding', '分片', '扩展', '性能'],
+    '跨链技术': ['cross-chain', 'interoperability', '跨链'],
+    '数字钱包': ['wallet', '钱包'],
+    '预言机': ['oracle', '预言机'],
+    '去中心化治理': ['governance', '治理'],
+    '去中心化金融': ['defi', 'decentralized finance', '去中心化金融'],
+    'NFT': ['nft', '非同质化代币'],
+    'Layer2': ['layer 2', 'layer2', 'layer-2', 'rollup', '二层'],
+    '挖矿': ['miner', 'mining', '挖矿', '矿工'],
+    '加密货币': ['cryptocurrency', 'token', 'tokenomics', '代币', '数字货币'],
+    '分布式系统': ['distributed', '分布式'],
+    '数据存储': ['storage', '存储'],
+    '网络协议': ['network', '网络'],
+    '密码学': ['cryptographic', 'cryptography', '密码', '哈希', '签名'],
+    '以太坊': ['ethereum', '以太坊'],
+    '比特币': ['bitcoin', '比特币']
+}
+
+# 9. 默认相关性判断提示词（频道可自定义，须包含 {title} 与 {abstract} 占位符）
+DEFAULT_RELEVANCE_PROMPT = """
+你是一位计算机科学领域的专家。请根据以下论文信息，判断其研究内容是否主要属于"区块链"或"分布式账本技术"领域。
+这包括但不限于：共识算法、智能合约、密码学协议、去中心化应用、Layer2扩容方案、跨链技术等。
+
+论文标题：{title}
+摘要：{abstract}
+
+请仅回答"是"或"否"。不要解释原因。
+""".strip()
+
+# 10. 各类大模型调用的 token 预算：(输入上限, 输出上限)，超出输入上限的提示词不会被发送
+LLM_TOKEN_BUDGETS = {
+    'relevance': (1200, 16),
+    'selection': (8000, 16),
+    'summary': (2500, 1024),
+}
+SELECTION_MIN_ABSTRACT_TOKENS = 60
+
+# 11. 话题词表：小红书封面文字（按优先级排列）
+COVER_TOPICS = {
+    '共识': HASHTAG_TOPICS['共识机制'],
+    '智能合约': HASHTAG_TOPICS['智能合约'],
+    '安全': HASHTAG_TOPICS['网络安全'],
+    '隐私': HASHTAG_TOPICS['隐私保护'],
+    '性能': HASHTAG_TOPICS['性能优化'],
+    '跨链': HASHTAG_TOPICS['跨链技术'],
+    '钱包': HASHTAG_TOPICS['数字钱包'],
+    '预言机': HASHTAG_TOPICS['预言机'],
+    '治理': HASHTAG_TOPICS['去中心化治理'],
+    'defi': HASHTAG_TOPICS['去中心化金融'],
+    'nft': HASHTAG_TOPICS['NFT'],
+    'layer2': HASHTAG_TOPICS['Layer2'],
+    '矿工': HASHTAG_TOPICS['挖矿'],
+    '数字货币': HASHTAG_TOPICS['加密货币'],
+    '分布式': HASHTAG_TOPICS['分布式系统'],
+    '存储': HASHTAG_TOPICS['数据存储'],
+    '网络': HASHTAG_TOPICS['网络协议']
+}
+
+# 12. 性能分析（--profile）：结果目录与调用栈采样间隔（秒）
+PROFILE_DIR = "profile_reports"
+PROFILE_SAMPLE_INTERVAL = 0.005
+
+# 13. 静态归档站点：归档记录文件、输出目录、站点地址（用于 RSS 绝对链接，可留空）与 RSS 条目数
+ARCHIVE_RECORDS_FILE = "report_archive.jsonl"
+ARCHIVE_SITE_DIR = "site"
+ARCHIVE_SITE_URL = os.getenv("ARCHIVE_SITE_URL", "")
+ARCHIVE_FEED_SIZE = 20
+
+# 14. ArXiv 访问层：分页大小与请求间隔（秒）按 (初始值, 下限, 上限) 自适应调整，
+#     arXiv 要求两次请求至少间隔 3 秒；原始 Atom 页面缓存当天有效，过期后带条件请求重新验证
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_PAGE_SIZE = (100, 25, 400)
+ARXIV_DELAY_SECONDS = (3.0, 3.0, 60.0)
+ARXIV_MAX_RETRIES = 4
+ARXIV_REQUEST_TIMEOUT = 30
+ARXIV_FAST_RESPONSE_SECONDS = 5
+ARXIV_CACHE_DIR = "arxiv_cache"
+ARXIV_CACHE_KEEP_DAYS = 7
+ARXIV_OUTAGE_SECONDS = 600
+
 
 # -------------------------------
 # 辅助函数
 # -------------------------------
 
+class KeywordMatcher:
+    """预编译的多词项匹配器，一次扫描文本即可返回全部命中的标签
+
+    - 词表在构造时编译为单个正则（长词项优先），之后每次匹配只扫描一遍文本
+    - 以字母/数字开头或结尾的词项按词边界匹配，避免 'CCS' 命中 'accessibility'
+    - 不含空格的全大写缩写（如 'ASE'、'S&P'）大小写敏感，其余词项（包括 'ASIA CCS' 这样的多词缩写）
+      忽略大小写；扫描时较长的词项优先，'Asia CCS' 整体命中后不会再单独命中其中的 'CCS'
+    - 中文词项按子串匹配
+    - phrase_boundary 为 True 时，多词全称（如 'International Conference on Machine Learning'）
+      之后必须紧跟括号、标点、年份或文本结尾，避免命中以其开头的其他会议全称
+    - context_terms 中的词项只在会议上下文中命中：后接年份或 Conference/Symposium/Workshop，
+      或前面是 IEEE/ACM/IFIP
+    """
+
+    # 多词全称之后允许出现的内容：标点/括号、年份或文本结尾
+    _PHRASE_END = r"""(?=\s*(?:[()\[\],;:.!?/|\-–—]|'?\d{2,4}(?![A-Za-z0-9])|$))"""
+    # 易混淆缩写的会议上下文
+    _VENUE_CONTEXT_BEFORE = r'(?:(?<=IEEE )|(?<=ACM )|(?<=IFIP ))'
+    _VENUE_CONTEXT_AFTER = r"""(?=\s*(?:'?\d{2,4}(?![A-Za-z0-9])|[Cc]onference|[Ss]ymposium|[Ww]orkshop))"""
+
+    def __init__(self, lexicon: Dict[str, List[str]], allow_plural: bool = False, phrase_boundary: bool = False,
+                 context_terms: Optional[set] = None):
+        self.labels = list(lexicon)
+        context_terms = context_terms or set()
+        term_labels: Dict[Tuple[str, bool, bool], List[str]] = {}
+        for label, terms in lexicon.items():
+            for term in terms:
+                acronym = term.upper() == term and any(c.isalpha() and c.isascii() for c in term)
+                case_sensitive = acronym and ' ' not in term
+                key = (term if case_sensitive else term.lower(), case_sensitive, acronym)
+                term_labels.setdefault(key, [])
+                if label not in term_labels[key]:
+                    term_labels[key].append(label)
+
+        # 以字母/数字开头的词项共用一个前置词边界断言，词中间的位置可立即跳过
+        self._group_labels: Dict[str, List[str]] = {}
+        word_parts, other_parts = [], []
+        for i, (key, labels) in enumerate(sorted(term_labels.items(), key=lambda item: -len(item[0][0]))):
+            term, case_sensitive, acronym = key
+            pattern = re.escape(term)
+            if allow_plural and term[-1].isascii() and term[-1].isalpha():
+                pattern += r'(?:e?s)?'
+            if term[-1].isascii() and term[-1].isalnum():
+                pattern += r'(?![A-Za-z0-9])'
+            if phrase_boundary and not acronym and ' ' in term:
+                pattern += self._PHRASE_END
+            if term in context_terms:
+                pattern = f'(?:{self._VENUE_CONTEXT_BEFORE}{pattern}|{pattern}{self._VENUE_CONTEXT_AFTER})'
+            if case_sensitive:
+                pattern = f'(?-i:{pattern})'
+            group = f't{i}'
+            self._group_labels[group] = labels
+            if term[0].isascii() and term[0].isalnum():
+                word_parts.append(f'(?P<{group}>{pattern})')
+            else:
+                other_parts.append(f'(?P<{group}>{pattern})')
+        parts = other_parts
+        if word_parts:
+            parts = [r'(?<![A-Za-z0-9])(?:' + '|'.join(word_parts) + ')'] + other_parts
+        self._regex = re.compile('|'.join(parts), re.IGNORECASE) if parts else None
+
+    def find_all(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """返回文本中命中的全部标签（按词表顺序排列，可选截断）"""
+        if not text or self._regex is None:
+            return []
+        hits = set()
+        for match in self._regex.finditer(text):
+            hits.update(self._group_labels[match.lastgroup])
+        found = [label for label in self.labels if label in hits]
+        return found[:limit] if limit else found
+
+
+# 导入时一次性编译的匹配器
+CCF_VENUE_RANKS = {name: rank for rank, venues in CCF_VENUE_CATALOG.items() for name in venues}
+CCF_VENUE_MATCHER = KeywordMatcher(
+    {name: [name] + aliases for venues in CCF_VENUE_CATALOG.values() for name, aliases in venues.items()},
+    phrase_boundary=True, context_terms=CCF_AMBIGUOUS_ACRONYMS
+)
+HASHTAG_TOPIC_MATCHER = KeywordMatcher(HASHTAG_TOPICS, allow_plural=True)
+COVER_TOPIC_MATCHER = KeywordMatcher(COVER_TOPICS, allow_plural=True)
+
+
+def match_ccf_venues(text: str) -> List[Tuple[str, str]]:
+    """返回文本中出现的全部 CCF 会议/期刊，形如 [(规范名称, 等级), ...]"""
+    return [(name, CCF_VENUE_RANKS[name]) for name in CCF_VENUE_MATCHER.find_all(text)]
+
+def get_ccf_rank(venue: str) -> Optional[str]:
+    """返回发表 venue 的最高 CCF 等级（'A'/'B'/'C'），未收录时返回 None
+
+    >>> get_ccf_rank("Accepted by International Conference on Software Engineering (ICSE 2026)")
+    'A'
+    >>> get_ccf_rank("International Conference on Machine Learning, PMLR 2025")
+    'A'
+    >>> get_ccf_rank("International Conference on Software Engineering and Knowledge Engineering (SEKE)")
+    'C'
+    >>> get_ccf_rank("International Conference on Machine Learning and Applications (ICMLA)") is None
+    True
+    >>> get_ccf_rank("International Conference on Computer Vision Theory and Applications") is None
+    True
+    >>> get_ccf_rank("Accepted at Asia CCS 2025")
+    'C'
+    >>> get_ccf_rank("To appear in The Journal of Supercomputing")
+    'C'
+    >>> get_ccf_rank("P2P overlay, 10 pages") is None
+    True
+    >>> get_ccf_rank("IEEE P2P 2019"), get_ccf_rank("Accepted at FC'25"), get_ccf_rank("SC 2024")
+    ('C', 'C', 'A')
+    >>> get_ccf_rank("Journal of Parallel and Distributed Computing (JPDC)")
+    'B'
+    """
+    ranks = [rank for _, rank in match_ccf_venues(venue)]
+    return min(ranks) if ranks else None
+
+def paper_key(link: str) -> str:
+    """论文去重键：去掉 ArXiv 链接末尾的版本号"""
+    return re.sub(r'v\d+$', '', link.strip())
+
+
+class AbstractStore:
+    """论文摘要的本地存储：完整检索结果按行追加写入 JSON Lines 文件，内存中只保留各行的偏移量
+
+    同一文件重复打开时会先扫描已有记录建立索引，已存在的论文不会重复写入；上次写入中断留下的
+    不完整末行会被截掉。可作为上下文管理器使用，关闭后不能再写入，但仍可按需读取摘要。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'a+b')
+        self._file.seek(0)
+        offset = 0
+        for line in self._file:
+            try:
+                record_id = json.loads(line)['id'] if line.endswith(b'\n') else None
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+                record_id = None
+            if record_id is None:
+                print(f"[WARN] {path} 末尾存在不完整的记录，已截断")
+                self._file.truncate(offset)
+                break
+            self._offsets[record_id] = (offset, len(line))
+            offset += len(line)
+
+    def __enter__(self) -> 'AbstractStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """关闭写入句柄；之后的读取按需临时打开文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def put(self, paper_id: str, record: Dict):
+        """写入一条论文记录（须包含 'summary' 字段）"""
+        with self._lock:
+            if paper_id in self._offsets:
+                return
+            line = (json.dumps(dict(record, id=paper_id), ensure_ascii=False, default=str) + '\n').encode('utf-8')
+            self._file.seek(0, os.SEEK_END)
+            self._offsets[paper_id] = (self._file.tell(), len(line))
+            self._file.write(line)
+            self._file.flush()
+
+    def get(self, paper_id: str) -> str:
+        """按偏移量读取论文摘要"""
+        with self._lock:
+            offset, length = self._offsets[paper_id]
+            if self._file is None:
+                with open(self.path, 'rb') as f:
+                    f.seek(offset)
+                    return json.loads(f.read(length))['summary']
+            self._file.seek(offset)
+            return json.loads(self._file.read(length))['summary']
+
+
+class Paper:
+    """候选论文记录
+
+    使用 __slots__ 压缩内存，作者名经过驻留以便在大量论文间复用；
+    提供 store 时摘要写入本地存储，只有在真正需要正文的阶段才读取。
+    """
+
+    __slots__ = ('paper_id', 'title', 'authors', 'link', 'published', 'comment', 'affiliation',
+                 'keywords', 'topics', 'ccf_rank', '_summary', '_store')
+
+    def __init__(self, title: str, summary: str, authors: List[str], link: str, published: datetime,
+                 comment: str = "", affiliation: str = "", keywords: Optional[List[str]] = None,
+                 store: Optional[AbstractStore] = None):
+        self.paper_id = paper_key(link)
+        self.title = title
+        self.authors = tuple(sys.intern(name) for name in authors)
+        self.link = link
+        self.published = published
+        self.comment = comment or ""
+        self.affiliation = affiliation
+        self.keywords = keywords or []
+        self.topics: List[str] = []
+        self.ccf_rank: Optional[str] = None
+        self._store = store
+        self._summary = None
+        if store is None:
+            self._summary = summary
+        else:
+            store.put(self.paper_id, {"title": title, "summary": summary, "authors": list(self.authors),
+                                      "link": link, "published": published, "comment": self.comment})
+
+    @property
+    def summary(self) -> str:
+        """论文摘要，存放在本地存储中时按需读取"""
+        if self._summary is not None:
+            return self._summary
+        return self._store.get(self.paper_id)
+
+
+class PaperIndex:
+    """往期论文的本地语义索引
+
+    对标题和摘要中的词及相邻词对做带符号的特征哈希，得到对数词频向量；向量以 float32 追加写入
+    vectors.f32 并通过内存映射读取，recommended.i4 记录每篇论文首次被推荐的日期（0 表示未推荐），
+    meta.jsonl 记录每行对应的论文。
+    IDF 权重不写入向量，而是在查询时按当前文档频率施加：相似度为 (q·w²·d) / (|q·w|·|d·w|)，
+    其中各文档的加权范数在两次追加之间缓存，查询仍只需一次矩阵乘法，再用 argpartition 取 top-k。
+    """
+
+    _STOPWORDS = frozenset(
+        'a an and are as at be by can for from has have in into is it its of on or our over such than that '
+        'the their these this to via we which with'.split()
+    )
+
+    def __init__(self, directory: str = PAPER_INDEX_DIR, dim: int = PAPER_INDEX_DIM):
+        self.dim = dim
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, 'vectors.f32')
+        self._recommended_path = os.path.join(directory, 'recommended.i4')
+        self._meta_path = os.path.join(directory, 'meta.jsonl')
+        self._df_path = os.path.join(directory, 'df.npy')
+
+        # 哈希维度变化后旧向量无法复用，重新建立索引
+        if os.path.exists(self._df_path) and len(np.load(self._df_path)) != dim + 1:
+            print(f"[WARN] 往期论文索引的维度与 PAPER_INDEX_DIM={dim} 不一致，重新建立索引")
+            for path in (self._vectors_path, self._recommended_path, self._meta_path, self._df_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self._row_of: Dict[str, int] = {}
+        self._meta_offsets: List[int] = []
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    self._row_of[json.loads(line)['id']] = len(self._meta_offsets)
+                    self._meta_offsets.append(offset)
+                    offset += len(line)
+        # meta.jsonl 最后写入；上次追加中断时截掉多余的向量与推荐日期，保持各文件行数一致
+        for path, row_size in ((self._vectors_path, dim * 4), (self._recommended_path, 4)):
+            if os.path.exists(path) and os.path.getsize(path) > len(self._meta_offsets) * row_size:
+                os.truncate(path, len(self._meta_offsets) * row_size)
+        # 文档频率：前 dim 项为各哈希桶的文档数，最后一项为文档总数
+        self._df = np.load(self._df_path) if os.path.exists(self._df_path) else np.zeros(dim + 1, dtype=np.int64)
+        self._vectors = None
+        self._recommended = None
+        self._doc_norms = None
+
+    def __len__(self) -> int:
+        return len(self._meta_offsets)
+
+    def _hash_counts(self, texts: List[str]):
+        """把文本映射为带符号的哈希词频矩阵"""
+        counts = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            words = [word for word in re.findall(r'[a-z0-9]+', text.lower())
+                     if len(word) > 1 and word not in self._STOPWORDS]
+            terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            if not terms:
+                continue
+            hashes = np.fromiter((zlib.crc32(term.encode('utf-8')) for term in terms), dtype=np.uint32, count=len(terms))
+            signs = np.where(hashes >> 31, -1.0, 1.0)
+            counts[i] = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+        return counts
+
+    @staticmethod
+    def _log_tf(counts):
+        """带符号的对数词频"""
+        return (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+
+    def _idf(self):
+        """按当前文档频率计算各哈希桶的 IDF"""
+        return (np.log((self._df[self.dim] + 1) / (self._df[:self.dim] + 1)) + 1).astype(np.float32)
+
+    def _open(self):
+        """打开向量与推荐日期的内存映射，并计算各文档在当前 IDF 下的加权范数"""
+        if self._vectors is None:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(len(self), self.dim))
+        if self._recommended is None:
+            self._recommended = np.memmap(self._recommended_path, dtype=np.int32, mode='r', shape=(len(self),))
+        if self._doc_norms is None:
+            idf_squared = self._idf() ** 2
+            norms = np.empty(len(self), dtype=np.float32)
+            # 分块计算，避免一次性生成与整个向量文件等大的临时矩阵
+            for start in range(0, len(self), 65536):
+                block = self._vectors[start:start + 65536]
+                norms[start:start + len(block)] = np.sqrt((block * block) @ idf_squared)
+            norms[norms == 0] = 1
+            self._doc_norms = norms
+
+    def add_papers(self, papers: List[Paper]):
+        """增量追加尚未收录的论文"""
+        new_papers = [paper for paper in dict((paper.paper_id, paper) for paper in papers).values()
+                      if paper.paper_id not in self._row_of]
+        if not new_papers:
+            return
+
+        counts = self._hash_counts([f"{paper.title}\n{paper.summary}" for paper in new_papers])
+        self._df[:self.dim] += np.count_nonzero(counts, axis=0)
+        self._df[self.dim] += len(new_papers)
+
+        with open(self._vectors_path, 'ab') as f:
+            f.write(self._log_tf(counts).tobytes())
+        with open(self._recommended_path, 'ab') as f:
+            f.write(np.zeros(len(new_papers), dtype=np.int32).tobytes())
+        with open(self._meta_path, 'ab') as f:
+            offset = f.tell()
+            for paper in new_papers:
+                line = (json.dumps({"id": paper.paper_id, "title": paper.title, "link": paper.link,
+                                    "published": paper.published.strftime('%Y-%m-%d')}, ensure_ascii=False) + '\n').encode('utf-8')
+                f.write(line)
+                self._row_of[paper.paper_id] = len(self._meta_offsets)
+                self._meta_offsets.append(offset)
+                offset += len(line)
+        with open(self._df_path + '.tmp', 'wb') as f:
+            np.save(f, self._df)
+        os.replace(self._df_path + '.tmp', self._df_path)
+        self._vectors = None
+        self._recommended = None
+        self._doc_norms = None
+
+    def mark_recommended(self, paper: Paper, on: Optional[datetime] = None):
+        """记录论文在 on 当天被推荐（默认今天），之后可作为"往期相关推荐"出现；重复推荐时保留最早的日期"""
+        self.add_papers([paper])
+        day = (on or datetime.now()).date().toordinal()
+        recommended = np.memmap(self._recommended_path, dtype=np.int32, mode='r+', shape=(len(self),))
+        row = self._row_of[paper.paper_id]
+        if recommended[row] == 0 or recommended[row] > day:
+            recommended[row] = day
+            recommended.flush()
+        self._recommended = None
+
+    def query(self, texts: List[str], k: int = RELATED_PAPER_COUNT, recommended_only: bool = True,
+              exclude_ids: Optional[set] = None, before: Optional[datetime] = None,
+              min_score: float = RELATED_PAPER_MIN_SCORE) -> List[List[Dict]]:
+        """批量查询与各文本余弦相似度最高的 k 篇论文，相似度低于 min_score 的结果不返回
+
+        before 不为空时只返回在该日期之前推荐过的论文，供回填历史日报时避免引用之后才推荐的论文。
+        """
+        if not len(self) or not texts:
+            return [[] for _ in texts]
+        self._open()
+
+        idf = self._idf()
+        queries = self._log_tf(self._hash_counts(texts)) * idf
+        query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        query_norms[query_norms == 0] = 1
+        scores = ((queries * idf) / query_norms) @ self._vectors.T / self._doc_norms
+        if recommended_only:
+            scores[:, self._recommended == 0] = -np.inf
+        if before is not None:
+            scores[:, self._recommended >= before.date().toordinal()] = -np.inf
+        for paper_id in exclude_ids or ():
+            if paper_id in self._row_of:
+                scores[:, self._row_of[paper_id]] = -np.inf
+
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        with open(self._meta_path, 'rb') as f:
+            for row_scores, rows in zip(scores, top):
+                matches = []
+                for row in rows[np.argsort(-row_scores[rows])]:
+                    if not np.isfinite(row_scores[row]) or row_scores[row] < min_score:
+                        continue
+                    f.seek(self._meta_offsets[row])
+                    matches.append(dict(json.loads(f.readline()), score=float(row_scores[row])))
+                results.append(matches)
+        return results
+
+
+_paper_index: Optional[PaperIndex] = None
+
+def get_paper_index() -> Optional[PaperIndex]:
+    """打开（或复用）往期论文索引；未安装 numpy 时返回 None"""
+    global _paper_index
+    if np is None:
+        return None
+    if _paper_index is None:
+        _paper_index = PaperIndex()
+    return _paper_index
+
+def find_related_papers(paper: Paper, k: int = RELATED_PAPER_COUNT, before: Optional[datetime] = None) -> List[Dict]:
+    """查找与论文最相关的 k 篇往期推荐论文；before 不为空时只考虑该日期之前推荐的论文"""
+    index = get_paper_index()
+    if index is None:
+        return []
+    index.add_papers([paper])
+    return index.query([f"{paper.title}\n{paper.summary}"], k=k, exclude_ids={paper.paper_id}, before=before)[0]
+
+def mark_paper_recommended(paper: Paper, on: Optional[datetime] = None):
+    """在往期论文索引中记录论文的推荐日期（默认今天）"""
+    index = get_paper_index()
+    if index is not None:
+        index.mark_recommended(paper, on=on)
+
+
+def tag_paper(paper: Paper) -> Paper:
+    """为论文打上话题与 CCF 等级标签（原地修改并返回）"""
+    paper.topics = HASHTAG_TOPIC_MATCHER.find_all(f"{paper.title}\n{paper.summary}")
+    paper.ccf_rank = get_ccf_rank(paper.comment)
+    return paper
+
 def contains_keywords(text: str, keywords: List[str]) -> bool:
     """检查文本是否包含任一关键词"""
     text_lower = text.lower()
     return any(kw.lower() in text_lower for kw in keywords)
 
-def call_qwen(prompt: str) -> Optional[str]:
-    """调用通义千问 API"""
+# 本次运行的统计信息：每次大模型调用的任务类型与输入/输出 token 数
+RUN_STATS = {"llm_calls": [], "arxiv": {"requests": 0, "cache_hits": 0, "revalidated": 0, "retries": 0}}
+
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]')
+_LATEX_PATTERNS = [
+    (re.compile(r'\\cite[a-z]*\{[^{}]*\}'), ''),
+    (re.compile(r'\\(?:emph|textbf|textit|texttt|textrm|text|mathrm|mathbf|mathcal|mathsf)\{([^{}]*)\}'), r'\1'),
+    # 紧跟数字金额的 $（如 "$5 and $10"）不视为数学公式的开始
+    (re.compile(r'\$\$?(?!\d[\d,.]*(?:\s|[;:!?)]|$))([^$]*)\$\$?'), r'\1'),
+    (re.compile(r'\\([A-Za-z]+)'), r'\1'),
+    (re.compile(r'[{}]'), ''),
+    (re.compile(r'~'), ' '),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r' ([.,;:])'), r'\1'),
+]
+_SENTENCE_SPLIT = re.compile(r'(?<=[。！？])|(?<=[.!?])\s+')
+
+def estimate_tokens(text: str) -> int:
+    """近似估算 token 数：中日韩字符按 1 个 token，其余字符约 4 个字符 1 个 token"""
+    if not text:
+        return 0
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    return cjk_count + -(-(len(text) - cjk_count) // 4)
+
+def compact_abstract(text: str, max_tokens: int) -> str:
+    """压缩摘要：规范空白与 LaTeX 标记，超出预算时按句截断
+
+    >>> compact_abstract("Fees drop from $5 and $10 to $O(n^2)$ per block.", 100)
+    'Fees drop from $5 and $10 to O(n^2) per block.'
+    """
+    for pattern, replacement in _LATEX_PATTERNS:
+        text = pattern.sub(replacement, text)
+    text = text.strip()
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 1:
+        return ""
+
+    sentences = [sentence for sentence in _SENTENCE_SPLIT.split(text) if sentence]
+    kept = []
+    used = 1  # 为省略号预留
+    for sentence in sentences:
+        cost = estimate_tokens(sentence) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    if not kept:
+        # 首句就超出预算时按比例截断字符
+        first = sentences[0]
+        kept = [first[:len(first) * (max_tokens - 1) // (estimate_tokens(first) + 1)]]
+    return ' '.join(kept).strip() + '…'
+
+def build_prompt(task: str, template: str, **fields) -> str:
+    """按任务的 token 预算构造提示词，'abstract' 字段会被压缩到剩余预算以内"""
+    input_budget, _ = LLM_TOKEN_BUDGETS.get(task, (None, None))
+    if 'abstract' in fields:
+        abstract = fields.pop('abstract')
+        if input_budget is None:
+            fields['abstract'] = compact_abstract(abstract, estimate_tokens(abstract))
+        else:
+            overhead = estimate_tokens(template.format(abstract='', **fields).strip())
+            fields['abstract'] = compact_abstract(abstract, input_budget - overhead)
+    return template.format(**fields).strip()
+
+def reset_run_stats():
+    """清空本次运行的统计信息，定时任务每天的统计互不累加"""
+    RUN_STATS["llm_calls"].clear()
+    for counter in RUN_STATS["arxiv"]:
+        RUN_STATS["arxiv"][counter] = 0
+
+def record_llm_call(task: str, input_tokens: int, output_tokens: int):
+    """记录一次大模型调用的 token 用量"""
+    RUN_STATS["llm_calls"].append({"task": task, "input_tokens": input_tokens, "output_tokens": output_tokens})
+
+def print_run_stats():
+    """按任务类型汇总打印本次运行的大模型 token 用量"""
+    totals: Dict[str, List[int]] = {}
+    for call in RUN_STATS["llm_calls"]:
+        total = totals.setdefault(call["task"], [0, 0, 0])
+        total[0] += 1
+        total[1] += call["input_tokens"]
+        total[2] += call["output_tokens"]
+    for task, (count, input_tokens, output_tokens) in totals.items():
+        print(f"[STATS] {task}: {count} 次调用，输入 {input_tokens} tokens，输出 {output_tokens} tokens")
+    arxiv_stats = RUN_STATS["arxiv"]
+    if arxiv_stats["requests"] or arxiv_stats["cache_hits"]:
+        print(f"[STATS] arxiv: {arxiv_stats['requests']} 次请求（重试 {arxiv_stats['retries']} 次），"
+              f"缓存命中 {arxiv_stats['cache_hits']} 页，重新验证未变化 {arxiv_stats['revalidated']} 页")
+
+class StageProfiler:
+    """按流水线阶段收集 cProfile 统计、内存分配峰值以及 CPU 与等待时间
+
+    - 每个阶段的墙钟时间减去进程 CPU 时间即为等待时间（网络 I/O、sleep、等待线程池等）
+    - 内存峰值为 tracemalloc 记录的阶段内新增分配的最高值
+    - cProfile 只能覆盖主线程，因此另有采样线程定期抓取所有线程的调用栈，
+      输出 flamegraph.pl / speedscope 可直接读取的折叠栈（collapsed stack）格式
+    """
+
+    def __init__(self, sample_interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.sample_interval = sample_interval
+        self.stages: Dict[str, Dict] = {}
+        self.stacks: Dict[str, int] = {}
+        self._current: Optional[str] = None
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+
+    def start(self):
+        tracemalloc.start()
+        self._sampler.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """统计一个阶段；嵌套的阶段并入外层阶段"""
+        if self._current is not None:
+            yield
+            return
+        stats = self.stages.setdefault(name, {"runs": 0, "wall": 0.0, "cpu": 0.0, "peak": 0, "profile": cProfile.Profile()})
+        self._current = name
+        tracemalloc.reset_peak()
+        base_memory = tracemalloc.get_traced_memory()[0]
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        stats["profile"].enable()
+        try:
+            yield
+        finally:
+            stats["profile"].disable()
+            stats["wall"] += time.perf_counter() - wall_start
+            stats["cpu"] += time.process_time() - cpu_start
+            stats["peak"] = max(stats["peak"], tracemalloc.get_traced_memory()[1] - base_memory)
+            stats["runs"] += 1
+            self._current = None
+
+    def _sample(self):
+        """定期抓取除采样线程外所有线程的调用栈，按"阶段;最外层帧;...;最内层帧"计数"""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            stage = self._current or 'other'
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack = ';'.join([stage] + names[::-1]).replace('\n', ' ')
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def write_report(self, directory: str = PROFILE_DIR) -> str:
+        """停止采样并写出折叠栈、各阶段的 .pstats 文件与汇总表，返回结果目录"""
+        self._stop.set()
+        self._sampler.join()
+        tracemalloc.stop()
+
+        run_dir = os.path.join(directory, datetime.now().strftime('%Y%m%d_%H%M%S'))
+        os.makedirs(run_dir, exist_ok=True)
+        with open(os.path.join(run_dir, 'stacks.collapsed'), 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        lines = [f"{'stage':<12}{'runs':>6}{'wall(s)':>10}{'cpu(s)':>10}{'wait(s)':>10}{'wait%':>8}{'peak(MB)':>10}"]
+        details = []
+        for name, stats in self.stages.items():
+            stats["profile"].dump_stats(os.path.join(run_dir, f"{name}.pstats"))
+            wait = max(stats["wall"] - stats["cpu"], 0.0)
+            share = wait / stats["wall"] if stats["wall"] else 0.0
+            lines.append(f"{name:<12}{stats['runs']:>6}{stats['wall']:>10.2f}{stats['cpu']:>10.2f}"
+                         f"{wait:>10.2f}{share:>8.0%}{stats['peak'] / 1e6:>10.1f}")
+
+            # 各阶段自身耗时最多的函数
+            function_stats = pstats.Stats(stats["profile"]).stats
+            top = sorted(function_stats.items(), key=lambda item: item[1][2], reverse=True)[:5]
+            details.append(f"\n[{name}] 自身耗时最多的函数:")
+            for (filename, line, function), (_, calls, own_time, total_time, _) in top:
+                details.append(f"  {own_time:>8.3f}s {total_time:>8.3f}s {calls:>8}  {function} ({os.path.basename(filename)}:{line})")
+
+        summary = '\n'.join(lines + details) + '\n'
+        with open(os.path.join(run_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(summary)
+        for line in lines:
+            print(f"[STATS] {line}")
+        return run_dir
+
+
+# 性能分析器，仅在命令行传入 --profile 时创建
+PROFILER: Optional[StageProfiler] = None
+_NO_PROFILE = contextlib.nullcontext()
+
+def profile_stage(name: str):
+    """标记一个流水线阶段；未启用性能分析时直接返回空上下文，没有额外开销"""
+    if PROFILER is None:
+        return _NO_PROFILE
+    return PROFILER.stage(name)
+
+def enable_profiling():
+    """启用按阶段的性能分析"""
+    global PROFILER
+    PROFILER = StageProfiler()
+    PROFILER.start()
+    print(f"[INFO] 已启用性能分析，结果将保存至 '{PROFILE_DIR}/'")
+
+def write_profile_report():
+    """写出性能分析结果"""
+    run_dir = PROFILER.write_report()
+    print(f"[SUCCESS] 性能分析结果已保存至 '{run_dir}/'（stacks.collapsed 可用 flamegraph.pl 或 speedscope 查看）")
+
+# 当前模型是否支持 DashScope 的 JSON 输出格式，首次被接口拒绝后不再尝试
+_json_mode_supported = True
+
+def call_qwen(prompt: str, task: str = "default", json_mode: bool = False) -> Optional[str]:
+    """调用通义千问 API，按任务类型限制输入/输出 token 并记录用量
+
+    json_mode 为 True 时请求 DashScope 的 JSON 输出格式（模型不支持时自动退回普通输出）。
+    """
+    global _json_mode_supported
+    input_budget, output_budget = LLM_TOKEN_BUDGETS.get(task, (None, None))
+    input_tokens = estimate_tokens(prompt)
+    if input_budget is not None and input_tokens > input_budget:
+        print(f"[ERROR] 提示词约 {input_tokens} tokens，超出任务 '{task}' 的预算 {input_budget}，已跳过调用")
+        return None
+
     if DASHSCOPE_API_KEY == "YOUR_DASHSCOPE_API_KEY_HERE" or DASHSCOPE_API_KEY == "your-actual-api-key-here":
         print("[WARN] 未配置 DashScope API Key，将使用模拟响应")
         # 模拟API响应
         time.sleep(1)
+        record_llm_call(task, input_tokens, 1)
         return "是"
     
     headers = {
@@ -140,43 +1141,299 @@ def call_qwen(prompt: str) -> Optional[str]:
             "result_format": "message"
         }
     }
+    if output_budget is not None:
+        payload["parameters"]["max_tokens"] = output_budget
+    if json_mode and _json_mode_supported:
+        payload["parameters"]["response_format"] = {"type": "json_object"}
 
     try:
         response = requests.post(GENERATION_URL, headers=headers, data=json.dumps(payload))
+        if response.status_code == 400 and "response_format" in payload["parameters"]:
+            print("[WARN] 当前模型不支持 JSON 输出格式，改用普通输出重试")
+            _json_mode_supported = False
+            del payload["parameters"]["response_format"]
+            response = requests.post(GENERATION_URL, headers=headers, data=json.dumps(payload))
         response.raise_for_status()
         result = response.json()
-        return result['output']['choices'][0]['message']['content']
+        content = result['output']['choices'][0]['message']['content']
+        # 优先使用接口返回的实际用量，缺失时退回近似估算
+        usage = result.get('usage') or {}
+        record_llm_call(task, usage.get('input_tokens', input_tokens), usage.get('output_tokens', estimate_tokens(content)))
+        return content
     except Exception as e:
         print(f"[ERROR] 调用大模型失败: {e}")
         return None
 
 def is_blockchain_related(title: str, abstract: str) -> bool:
     """使用大模型判断论文是否与区块链相关"""
-    prompt = f"""
-你是一位计算机科学领域的专家。请根据以下论文信息，判断其研究内容是否主要属于"区块链"或"分布式账本技术"领域。
-这包括但不限于：共识算法、智能合约、密码学协议、去中心化应用、Layer2扩容方案、跨链技术等。
-
-论文标题：{title}
-摘要：{abstract}
+    return bool(is_relevant(title, abstract, DEFAULT_RELEVANCE_PROMPT))
 
-请仅回答"是"或"否"。不要解释原因。
-""".strip()
+def is_relevant(title: str, abstract: str, prompt_template: str) -> Optional[bool]:
+    """使用大模型按给定提示词模板判断论文是否符合主题，调用失败时返回 None"""
+    prompt = build_prompt('relevance', prompt_template, title=title, abstract=abstract)
 
-    answer = call_qwen(prompt)
+    answer = call_qwen(prompt, task='relevance')
     if not answer:
-        return False
+        return None
     
     # 简单处理，提取第一个词
     first_word = answer.strip().split()[0].lower() if answer.strip() else ""
     return first_word in ["是", "yes", "true", "✅"]
 
+# 同一次运行内共享的分类与解读缓存，多个频道或回填的重叠窗口只需付出边际调用；
+# 每次运行开始时清空，定时任务中前一天的结果（包括调用失败的影响）不会延续到下一天
+CLASSIFICATION_CACHE: Dict[Tuple[str, str], bool] = {}
+SUMMARY_CACHE: Dict[str, Dict] = {}
+
+def reset_run_caches():
+    """清空本次运行的分类与解读缓存"""
+    CLASSIFICATION_CACHE.clear()
+    SUMMARY_CACHE.clear()
+
+def classify_paper(paper: Paper, prompt_template: str = DEFAULT_RELEVANCE_PROMPT) -> bool:
+    """判断论文是否符合主题，相同论文与提示词的结果只请求一次大模型
+
+    调用失败时本次按不相关处理，但不写入缓存，之后遇到同一论文会重新请求。
+    """
+    key = (paper.paper_id, prompt_template)
+    if key not in CLASSIFICATION_CACHE:
+        related = is_relevant(paper.title, paper.summary, prompt_template)
+        time.sleep(1)  # 礼貌等待，避免频繁请求
+        if related is None:
+            return False
+        CLASSIFICATION_CACHE[key] = related
+    return CLASSIFICATION_CACHE[key]
+
+def get_summary_and_insights(paper: Paper) -> Dict:
+    """获取论文解读内容，同一论文被多个频道选中时复用结果"""
+    if paper.paper_id not in SUMMARY_CACHE:
+        SUMMARY_CACHE[paper.paper_id] = generate_summary_and_insights(paper.title, paper.summary, paper.link)
+    return SUMMARY_CACHE[paper.paper_id]
+
 def is_ccf_a_venue(venue: str) -> bool:
     """判断发表 venue 是否为 CCF-A 类"""
-    venue_lower = venue.lower()
-    for ccf_a in CCF_A_VENUES:
-        if ccf_a.lower() in venue_lower:
-            return True
-    return False
+    return get_ccf_rank(venue) == 'A'
+
+# 论文解读结果的字段要求，用于校验以及针对缺失字段的补充请求
+SUMMARY_FIELDS = {
+    "summary": "用一段简洁的中文（约100-150字）概述论文的核心思想、解决的问题以及取得的主要成果",
+    "insights": "由三个最重要的技术贡献或发现组成的字符串数组，每一点控制在20字以内",
+    "recommendation": "一句话说明为什么这篇文章值得关注",
+}
+SUMMARY_INSIGHT_COUNT = 3
+SUMMARY_DEFAULTS = {
+    "summary": "摘要生成出错。",
+    "insights": ["-", "-", "-"],
+    "recommendation": "暂无有效推荐语。",
+}
+
+def repair_json_object(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """提取文本中最外层的 JSON 对象并修复常见缺陷，返回 (修复后的文本, 被截断的顶层字段名)
+
+    可处理代码块围栏与前后说明文字、// 与 /* */ 注释、尾随逗号、字符串中的换行，
+    以及输出被截断导致的未闭合字符串、数组和对象。截断时正在输出的顶层字段虽然也会被补全，
+    但其内容不完整，调用方应将其视为缺失；该字段的取值为数组时只保留已完整输出的元素，
+    调用方可以保留这些元素，只补充其余部分。
+    """
+    start = text.find('{')
+    if start == -1:
+        return None, None
+
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+    string_start = 0
+    last_key = None      # 顶层最近一个字符串，遇到冒号时即为字段名
+    pending_key = None   # 顶层正在输出取值的字段名
+    item_start = 0       # 顶层字段取值为数组时，当前元素之前的 '[' 或 ',' 在 out 中的位置
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+                if len(stack) == 1:
+                    if pending_key is None:
+                        last_key = ''.join(out[string_start + 1:])
+                    else:
+                        pending_key = None
+            elif ch == '\n':
+                ch = '\\n'
+            out.append(ch)
+            i += 1
+            continue
+
+        if text.startswith('//', i):
+            end = text.find('\n', i)
+            i = len(text) if end == -1 else end
+            continue
+        if text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end == -1 else end + 2
+            continue
+        if ch == '"':
+            in_string = True
+            string_start = len(out)
+        elif ch == ':' and len(stack) == 1:
+            pending_key = last_key
+        elif ch == ',' and len(stack) == 1:
+            pending_key = None
+        elif ch == ',' and len(stack) == 2 and stack[-1] == ']':
+            item_start = len(out)
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+            if len(stack) == 2 and ch == '[':
+                item_start = len(out)
+        elif ch in '}]':
+            # 去掉闭合括号前的尾随逗号
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+            if stack:
+                stack.pop()
+            if len(stack) == 1:
+                pending_key = None
+            out.append(ch)
+            if not stack:
+                return ''.join(out), None
+            i += 1
+            continue
+        out.append(ch)
+        i += 1
+
+    # 输出被截断：顶层字段的取值为数组时丢弃不完整的最后一个元素，
+    # 其余情况补全字符串，再去掉悬空的键或逗号并依次闭合括号
+    if pending_key is not None and len(stack) >= 2 and stack[1] == ']':
+        tail = ''.join(out[item_start + 1:]).strip()
+        if len(stack) > 2 or in_string or (tail and not tail.endswith('"')):
+            del out[item_start + 1:]
+            del stack[2:]
+            in_string = False
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    repaired = ''.join(out).rstrip()
+    repaired = re.sub(r',?\s*"(?:[^"\\]|\\.)*"\s*:\s*$', '', repaired)
+    if stack and stack[-1] == '}':
+        repaired = re.sub(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*$', r'\1', repaired)
+    repaired = re.sub(r',\s*$', '', repaired)
+    if pending_key is not None:
+        try:
+            pending_key = json.loads(f'"{pending_key}"', strict=False)
+        except json.JSONDecodeError:
+            pass
+    return repaired + ''.join(reversed(stack)), pending_key
+
+def parse_json_response(raw_response: str) -> Optional[Dict]:
+    """尽量把大模型的回复解析为 JSON 对象，无法解析时返回 None
+
+    字符串中的制表符等控制字符按原样接受；输出被截断时，截断处的顶层字段会被丢弃，
+    由后续校验视为缺失并单独补充请求；该字段为数组时保留已完整输出的元素，只补充其余部分。
+    """
+    try:
+        data = json.loads(raw_response, strict=False)
+        if isinstance(data, dict):
+            return data
+    except json.JSONDecodeError:
+        pass
+
+    repaired, truncated_field = repair_json_object(raw_response)
+    if repaired is None:
+        return None
+    try:
+        data = json.loads(repaired, strict=False)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    if truncated_field is not None:
+        if isinstance(data.get(truncated_field), list) and data[truncated_field]:
+            print(f"[WARN] 大模型输出在字段 '{truncated_field}' 处被截断，保留已完整输出的 {len(data[truncated_field])} 项")
+        else:
+            print(f"[WARN] 大模型输出在字段 '{truncated_field}' 处被截断，该字段视为缺失")
+            data.pop(truncated_field, None)
+    return data
+
+# 要点前的项目符号或编号，如 "-"、"•"、"1."、"2)"、"(3)"、"一、"
+_INSIGHT_ENUMERATOR = re.compile(r'^\s*(?:[-–•*·]+|[(（]?\d{1,2}[.)、:：）](?!\d)|[一二三四五六七八九十][、.．])\s*')
+
+def clean_insights(value) -> List[str]:
+    """把要点规范为去掉编号的非空字符串列表，接受数组或按行分隔的字符串
+
+    >>> clean_insights("1. 分片共识\\n2) 跨链验证\\n- 3.5倍吞吐")
+    ['分片共识', '跨链验证', '3.5倍吞吐']
+    """
+    if isinstance(value, str):
+        value = value.splitlines()
+    if not isinstance(value, list):
+        return []
+    items = [_INSIGHT_ENUMERATOR.sub('', str(item)).strip() for item in value if not isinstance(item, (dict, list))]
+    return [item for item in items if item]
+
+def validate_summary_fields(data: Dict) -> Tuple[Dict, List[str]]:
+    """按 SUMMARY_FIELDS 校验解读结果，返回 (有效字段, 缺失或无效的字段名)
+
+    insights 需要至少 SUMMARY_INSIGHT_COUNT 个非空要点，不足时视为缺失。
+    """
+    valid = {}
+    for field in ("summary", "recommendation"):
+        value = data.get(field)
+        if isinstance(value, str) and value.strip():
+            valid[field] = value.strip()
+
+    insights = clean_insights(data.get("insights"))
+    if len(insights) >= SUMMARY_INSIGHT_COUNT:
+        valid["insights"] = insights[:SUMMARY_INSIGHT_COUNT]
+
+    return valid, [field for field in SUMMARY_FIELDS if field not in valid]
+
+def request_missing_summary_fields(title: str, abstract: str, missing: List[str],
+                                   known_insights: Optional[List[str]] = None) -> Dict:
+    """只针对缺失的字段发起一次补充请求，而不是重新生成全部内容
+
+    known_insights 为已有的不足数量的要点，此时只请求其余的要点并与已有要点合并。
+    """
+    template = """
+你是一位专业的科研内容解读助手。此前为下面这篇论文生成的解读结果缺少以下字段：{fields}。
+
+论文标题：{title}
+摘要原文：{abstract}
+
+请只补充这些字段，要求如下：
+{requirements}
+
+请严格按照JSON格式返回结果，只包含上述字段，不附加其他文字。
+"""
+    known_insights = known_insights or []
+    requirements = []
+    for field in missing:
+        if field == "insights" and known_insights:
+            requirements.append(
+                f'- "insights"：由另外 {SUMMARY_INSIGHT_COUNT - len(known_insights)} 个技术贡献或发现组成的字符串数组，'
+                f'每一点控制在20字以内，不要与已有要点重复：{"；".join(known_insights)}'
+            )
+        else:
+            requirements.append(f'- "{field}"：{SUMMARY_FIELDS[field]}')
+    prompt = build_prompt('summary', template, fields='、'.join(missing), title=title,
+                          abstract=abstract, requirements='\n'.join(requirements))
+    raw_response = call_qwen(prompt, task='summary', json_mode=True)
+    if not raw_response:
+        return {}
+    data = parse_json_response(raw_response) or {}
+    valid, _ = validate_summary_fields(data)
+    result = {field: value for field, value in valid.items() if field in missing}
+    if "insights" in missing and known_insights:
+        insights = list(dict.fromkeys(known_insights + clean_insights(data.get("insights"))))
+        if len(insights) >= SUMMARY_INSIGHT_COUNT:
+            result["insights"] = insights[:SUMMARY_INSIGHT_COUNT]
+    return result
 
 def generate_summary_and_insights(title: str, abstract: str, entry_id: str) -> Dict:
     """使用大模型生成中文摘要和核心亮点"""
@@ -190,7 +1447,7 @@ def generate_summary_and_insights(title: str, abstract: str, entry_id: str) -> D
             "recommendation": "这是模拟的推荐理由。"
         }
     
-    prompt = f"""
+    template = """
 你是一位专业的科研内容解读助手，尤其擅长将复杂的计算机科学研究转化为通俗易懂的语言。
 
 请阅读以下论文信息，并完成下列任务：
@@ -209,189 +1466,317 @@ def generate_summary_and_insights(title: str, abstract: str, entry_id: str) -> D
   "insights": ["要点1...", "要点2...", "要点3..."],
   "recommendation": "这句话应能激发读者兴趣..."
 }}
-""".strip()
+"""
+    prompt = build_prompt('summary', template, title=title, abstract=abstract, entry_id=entry_id)
 
-    raw_response = call_qwen(prompt)
+    raw_response = call_qwen(prompt, task='summary', json_mode=True)
     if not raw_response:
         return {
             "summary": "未能生成摘要。",
             "insights": ["-", "-", "-"],
             "recommendation": "暂无推荐语。"
         }
-    
-    try:
-        # 尝试解析 JSON
-        parsed_data = json.loads(raw_response)
-        return {
-            "summary": parsed_data.get("summary", "未提供摘要"),
-            "insights": parsed_data.get("insights", ["-", "-", "-"]),
-            "recommendation": parsed_data.get("recommendation", "暂无推荐语")
-        }
-    except json.JSONDecodeError:
-        print("[WARN] 大模型返回内容无法解析为JSON，使用默认值。")
-        return {
-            "summary": "摘要生成出错。",
-            "insights": ["-", "-", "-"],
-            "recommendation": "暂无有效推荐语。"
-        }
 
+    # 容错解析 JSON（去除围栏、提取对象、修复截断等），再按字段要求校验
+    parsed_data = parse_json_response(raw_response)
+    if parsed_data is None:
+        print("[WARN] 大模型返回内容无法解析为JSON，尝试补充请求。")
+    details, missing = validate_summary_fields(parsed_data or {})
+    # 要点数量不足（如截断的数组）时保留已有要点，只补充其余部分
+    known_insights = clean_insights((parsed_data or {}).get("insights")) if "insights" in missing else []
+
+    # 只对缺失或无效的字段发起补充请求
+    if missing:
+        print(f"[WARN] 解读结果缺少字段 {missing}，发起补充请求...")
+        details.update(request_missing_summary_fields(title, abstract, missing, known_insights))
+        missing = [field for field in SUMMARY_FIELDS if field not in details]
+
+    if missing:
+        print(f"[WARN] 字段 {missing} 仍然缺失，使用默认值。")
+        for field in missing:
+            details[field] = SUMMARY_DEFAULTS[field]
+        if "insights" in missing and known_insights:
+            details["insights"] = (known_insights + SUMMARY_DEFAULTS["insights"])[:SUMMARY_INSIGHT_COUNT]
+    return {field: details[field] for field in SUMMARY_FIELDS}
+
+
+class ArxivQueryError(Exception):
+    """ArXiv 拒绝了查询（如查询语法错误），重试无意义"""
+
+
+class ArxivUnavailableError(Exception):
+    """多次重试后 ArXiv 仍不可用，视为服务中断"""
+
+
+class ArxivAPI:
+    """共享的 ArXiv 访问层
+
+    - 所有请求共用一个礼貌间隔：出错时间隔加倍、分页减半，请求顺利时逐步恢复
+    - 原始 Atom 页面按 (查询, 起始位置) 缓存在 ARXIV_CACHE_DIR，当天重复的查询直接读取缓存；
+      缓存过期后带 If-None-Match / If-Modified-Since 重新验证，返回 304 或内容未变时沿用缓存
+    - 只有查询本身有误（HTTP 400 或 ArXiv 返回的错误条目）时抛出 ArxivQueryError；网络与传输错误、
+      无法解码或残缺的页面、意外为空的页面以及其他 HTTP 状态都可以重试，重试用尽时使用过期缓存，
+      没有缓存则抛出 ArxivUnavailableError，并在 ARXIV_OUTAGE_SECONDS 秒内不再请求，
+      后续页面直接使用缓存或立即失败
+    """
+
+    _NS = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom',
+           'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'}
+
+    def __init__(self, cache_dir: str = ARXIV_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.page_size = ARXIV_PAGE_SIZE[0]
+        self.delay = ARXIV_DELAY_SECONDS[0]
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'ai-blockchain-paper-share (+https://github.com/jialinpeng/ai-blockchain-paper-share)'
+        self._lock = threading.Lock()
+        self._next_request = 0.0
+        self._outage_until = 0.0
+        self._pruned = False
+
+    def results(self, query: str = "", id_list: Optional[List[str]] = None, max_results: Optional[int] = 100):
+        """按提交时间倒序逐页获取检索结果，逐条返回至多 max_results 篇论文的字典（None 表示取完为止）"""
+        params = {"search_query": query, "id_list": ','.join(id_list or []),
+                  "sortBy": "submittedDate", "sortOrder": "descending"}
+        start = 0
+        while max_results is None or start < max_results:
+            limit = self.page_size if max_results is None else min(self.page_size, max_results - start)
+            entries, total = self._fetch_page(params, start, limit)
+            yield from entries[:limit]
+            start += len(entries)
+            if not entries or start >= total:
+                break
 
-def get_recent_candidate_papers() -> List[Dict]:
-    """获取最近的候选论文列表"""
-    client = arxiv.Client()
+    def _parse_page(self, body: str) -> Tuple[List[Dict], int]:
+        """解析 Atom 页面，返回 (论文列表, 结果总数)"""
+        root = ET.fromstring(body)
+        entries = []
+        for entry in root.findall('atom:entry', self._NS):
+            entry_id = entry.findtext('atom:id', '', self._NS)
+            if '/api/errors' in entry_id:
+                raise ArxivQueryError(entry.findtext('atom:summary', '', self._NS).strip())
+            entries.append({
+                "title": ' '.join(entry.findtext('atom:title', '', self._NS).split()),
+                "summary": entry.findtext('atom:summary', '', self._NS).strip(),
+                "authors": [author.findtext('atom:name', '', self._NS) for author in entry.findall('atom:author', self._NS)],
+                "entry_id": entry_id,
+                "published": datetime.strptime(entry.findtext('atom:published', '', self._NS), '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc),
+                "comment": ' '.join(entry.findtext('arxiv:comment', '', self._NS).split()),
+            })
+        return entries, int(root.findtext('opensearch:totalResults', '0', self._NS))
+
+    def _cache_paths(self, params: Dict, start: int) -> Tuple[str, str]:
+        key = hashlib.sha256(json.dumps([params, start], sort_keys=True).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{key}.xml"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cache(self, params: Dict, start: int) -> Tuple[Optional[Dict], Optional[str]]:
+        body_path, meta_path = self._cache_paths(params, start)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'r', encoding='utf-8') as f:
+            return meta, f.read()
+
+    def _save_cache(self, params: Dict, start: int, meta: Dict, body: Optional[str] = None):
+        if not self._pruned:
+            self._prune_cache()
+        body_path, meta_path = self._cache_paths(params, start)
+        if body is not None:
+            atomic_write(body_path, body)
+        atomic_write(meta_path, json.dumps(meta, ensure_ascii=False))
+
+    def _prune_cache(self):
+        """删除超过 ARXIV_CACHE_KEEP_DAYS 天未更新的缓存页面"""
+        self._pruned = True
+        if not os.path.isdir(self.cache_dir):
+            return
+        cutoff = time.time() - ARXIV_CACHE_KEEP_DAYS * 86400
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+
+    def _wait_turn(self, not_before: float = 0.0):
+        """所有调用方共用的请求节流：两次请求之间至少间隔 self.delay 秒"""
+        with self._lock:
+            wait = max(self._next_request, not_before) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_request = time.monotonic() + self.delay
+
+    def _on_success(self, elapsed: float):
+        self.delay = max(ARXIV_DELAY_SECONDS[1], self.delay * 0.75)
+        if elapsed < ARXIV_FAST_RESPONSE_SECONDS:
+            self.page_size = min(ARXIV_PAGE_SIZE[2], int(self.page_size * 1.5))
+
+    def _on_error(self):
+        self.delay = min(ARXIV_DELAY_SECONDS[2], self.delay * 2)
+        self.page_size = max(ARXIV_PAGE_SIZE[1], self.page_size // 2)
+
+    def _fetch_page(self, params: Dict, start: int, page_size: int) -> Tuple[List[Dict], int]:
+        """获取从 start 开始的一页结果，优先使用当天的缓存"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        meta, cached_body = self._load_cache(params, start)
+        if meta is not None and meta['fetched_on'] == today:
+            RUN_STATS["arxiv"]["cache_hits"] += 1
+            return self._parse_page(cached_body)
+
+        if time.monotonic() < self._outage_until:
+            return self._fall_back_to_cache(meta, cached_body)
+
+        # 重新验证时沿用缓存页面的分页大小，保证请求的是同一页
+        headers = {}
+        if meta is not None:
+            page_size = meta['page_size']
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        not_before = 0.0
+        for attempt in range(ARXIV_MAX_RETRIES + 1):
+            if attempt:
+                RUN_STATS["arxiv"]["retries"] += 1
+            url = f"{ARXIV_API_URL}?{urlencode(dict(params, start=start, max_results=page_size))}"
+            self._wait_turn(not_before)
+            RUN_STATS["arxiv"]["requests"] += 1
+            request_start = time.monotonic()
+            try:
+                response = self.session.get(url, headers=headers, timeout=ARXIV_REQUEST_TIMEOUT)
+                body = response.content.decode('utf-8') if response.status_code == 200 else None
+            except requests.RequestException as e:
+                error = f"网络错误 {type(e).__name__}"
+            except UnicodeDecodeError as e:
+                error = f"页面无法解码 ({e})"
+            else:
+                elapsed = time.monotonic() - request_start
+                if response.status_code == 304 and meta is not None:
+                    self._on_success(elapsed)
+                    RUN_STATS["arxiv"]["revalidated"] += 1
+                    # 页面内容未变，同时更新正文的修改时间，避免仍在使用的缓存被按时间清理
+                    os.utime(self._cache_paths(params, start)[0])
+                    self._save_cache(params, start, dict(meta, fetched_on=today))
+                    return self._parse_page(cached_body)
+                if response.status_code == 400:
+                    raise ArxivQueryError(f"HTTP 400: {url}")
+                if response.status_code == 200:
+                    try:
+                        entries, total = self._parse_page(body)
+                    except ET.ParseError as e:
+                        error = f"页面不完整 ({e})"
+                    else:
+                        # ArXiv 偶尔会在还有结果时返回空页面，需要重试
+                        if entries or start >= total:
+                            self._on_success(elapsed)
+                            if cached_body == body:
+                                RUN_STATS["arxiv"]["revalidated"] += 1
+                            self._save_cache(params, start, {
+                                "fetched_on": today, "page_size": page_size,
+                                "etag": response.headers.get('ETag'), "last_modified": response.headers.get('Last-Modified'),
+                            }, body)
+                            return entries, total
+                        error = f"意外的空页面（共 {total} 条结果）"
+                else:
+                    error = f"HTTP {response.status_code}"
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        not_before = time.monotonic() + int(retry_after)
+
+            self._on_error()
+            # 非条件请求按缩小后的分页重试
+            if meta is None:
+                page_size = min(page_size, self.page_size)
+            print(f"[WARN] ArXiv 请求失败（第 {attempt + 1}/{ARXIV_MAX_RETRIES + 1} 次）：{error}，"
+                  f"请求间隔调整为 {self.delay:.0f} 秒，分页调整为 {self.page_size}")
+
+        self._outage_until = time.monotonic() + ARXIV_OUTAGE_SECONDS
+        return self._fall_back_to_cache(meta, cached_body)
+
+    def _fall_back_to_cache(self, meta: Optional[Dict], cached_body: Optional[str]) -> Tuple[List[Dict], int]:
+        """ArXiv 中断期间使用过期缓存，没有缓存时抛出 ArxivUnavailableError"""
+        if meta is None:
+            raise ArxivUnavailableError(f"ArXiv 在 {ARXIV_MAX_RETRIES + 1} 次尝试后仍不可用")
+        print(f"[WARN] ArXiv 暂时不可用，使用 {meta['fetched_on']} 缓存的结果页面")
+        return self._parse_page(cached_body)
+
+
+# 全部 ArXiv 请求共用一个访问层实例，共享请求间隔与自适应状态
+ARXIV_API = ArxivAPI()
+
+
+def get_recent_candidate_papers(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                                keywords: Optional[List[str]] = None) -> List[Paper]:
+    """获取候选论文列表，默认回溯最近 DAYS_TO_LOOK_BACK 天，也可指定历史时间范围和关键词
+
+    每篇论文只保留一份，其 keywords 属性记录命中的全部搜索关键词，供各频道筛选；
+    完整检索结果保存到 SEARCH_RESULTS_DIR 下以日期命名的文件中，摘要按需从该文件读取。
+    ArXiv 服务中断时抛出 ArxivUnavailableError，由调用方决定是否放弃本次运行。
+    """
     candidates = []
+    seen_papers = {}
     
-    # 计算搜索时间范围
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=DAYS_TO_LOOK_BACK)
-    
-    # 统一时区处理
-    import pytz
-    if end_date.tzinfo is None:
-        # 如果是naive datetime，添加本地时区信息
-        local_tz = pytz.timezone('UTC')  # 使用UTC时区
-        end_date = local_tz.localize(end_date)
-        start_date = local_tz.localize(start_date)
+    # 计算搜索时间范围；指定范围时按提交日期过滤，并抓取区间内的全部结果，
+    # 保证区间中较早的日期同样有完整的候选论文
+    explicit_range = start_date is not None or end_date is not None
+    end_date = end_date or datetime.now()
+    start_date = start_date or end_date - timedelta(days=DAYS_TO_LOOK_BACK)
+    max_results = MAX_RESULTS_PER_CATEGORY
+    date_filter = ""
+    if explicit_range:
+        max_results = None
+        date_filter = f" AND submittedDate:[{start_date.strftime('%Y%m%d%H%M')} TO {end_date.strftime('%Y%m%d%H%M')}]"
     
-    try:
-        # 按关键词搜索
-        for keyword in SEARCH_KEYWORDS:
+    # 统一时区处理：ArXiv 返回的时间均为 UTC，naive datetime 按 UTC 处理
+    start_date, end_date = _as_utc(start_date), _as_utc(end_date)
+
+    # 按关键词搜索；完整检索结果写入当天的摘要存储，抓取结束后关闭写入句柄
+    with AbstractStore(f"{SEARCH_RESULTS_DIR}/{datetime.now().strftime('%Y-%m-%d')}.jsonl") as store:
+        for keyword in keywords or SEARCH_KEYWORDS:
             print(f"[INFO] 正在搜索关键词 '{keyword}' ...")
-            
-            # 构造搜索关键词
-            search = arxiv.Search(
-                query=f"all:{keyword}",
-                max_results=MAX_RESULTS_PER_CATEGORY,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                sort_order=arxiv.SortOrder.Descending
-            )
-            
+            # 日常运行与回填使用同一种查询形式，多词关键词按短语检索
+            query = f'all:"{keyword}"{date_filter}'
+
             try:
-                results_batch = list(client.results(search))
-                print(f"[INFO] 关键词 '{keyword}' 找到 {len(results_batch)} 篇论文")
-                
-                for paper in results_batch:
+                # 逐条处理结果，不在内存中保留整批检索结果
+                result_count = 0
+                for paper in ARXIV_API.results(query, max_results=max_results):
+                    result_count += 1
                     # 检查是否在时间范围内
-                    paper_date = paper.published
-                    # 统一时区处理
-                    if paper_date.tzinfo is None and start_date.tzinfo is not None:
-                        # 如果论文日期是naive datetime，但我们的日期是aware datetime
-                        paper_date = pytz.UTC.localize(paper_date)
-                    elif paper_date.tzinfo is not None and start_date.tzinfo is None:
-                        # 如果论文日期是aware datetime，但我们的日期是naive datetime
-                        paper_date = paper_date.replace(tzinfo=None)
-                        start_date = start_date.replace(tzinfo=None)
-                        end_date = end_date.replace(tzinfo=None)
-                        
-                    if start_date <= paper_date <= end_date:
-                        candidates.append({
-                            "title": paper.title,
-                            "summary": paper.summary,
-                            "authors": [author.name for author in paper.authors],
-                            "link": paper.entry_id,
-                            "published": paper.published,
-                            "comment": getattr(paper, 'comment', '')
-                        })
-            except Exception as e:
+                    paper_date = paper['published']
+                    if paper_date < start_date and explicit_range:
+                        # 结果按提交时间倒序，之后的论文都早于区间起点
+                        break
+                    if not start_date <= paper_date <= end_date:
+                        continue
+                    if paper['entry_id'] in seen_papers:
+                        seen_papers[paper['entry_id']].keywords.append(keyword)
+                        continue
+                    seen_papers[paper['entry_id']] = Paper(
+                        title=paper['title'],
+                        summary=paper['summary'],
+                        authors=paper['authors'],
+                        link=paper['entry_id'],
+                        published=paper['published'],
+                        comment=paper['comment'],
+                        keywords=[keyword],
+                        store=store
+                    )
+                    candidates.append(seen_papers[paper['entry_id']])
+                print(f"[INFO] 关键词 '{keyword}' 找到 {result_count} 篇论文")
+            except ArxivQueryError as e:
                 print(f"[WARN] 搜索关键词 '{keyword}' 时出错: {e}")
                 continue
-                
-        print(f"[INFO] 总共筛选出 {len(candidates)} 篇候选论文")
-        return candidates
-        
-    except Exception as e:
-        print(f"[ERROR] 获取论文时发生网络错误: {e}")
-        print("[INFO] 将使用模拟数据进行演示")
-        # 提供一些不同的模拟数据用于测试
-        mock_papers = [
-            {
-                "title": "LMM-Incentive: Large Multimodal Model-based Incentive Design for User-Generated Content in Web 3.0",
-                "summary": "Web 3.0让每个人都能拥有和赚钱自己的内容，但也引来偷懒刷低质内容骗奖励的用户。本文提出LMM-Incentive，用强大的多模态AI模型当'裁判'，结合智能合约和强化学习，设计出能自动激励高质量创作的奖励机制，有效防止作弊，提升平台公平与效率。",
-                "authors": ["Jinbo Wen", "Jiawen Kang", "Linfeng Zhang", "Xiaoying Tang", "Jianhang Tang", "Yang Zhang", "Zhaohui Yang", "Dusit Niyato"],
-                "link": "http://arxiv.org/abs/2510.04765v1",
-                "published": datetime.now() - timedelta(days=1),
-                "comment": ""
-            },
-            {
-                "title": "ConsensusNet: A Novel High-Throughput Consensus Algorithm for Blockchain Networks",
-                "summary": "区块链网络的共识算法直接影响系统的吞吐量和安全性。本文提出了一种名为ConsensusNet的新共识算法，结合了拜占庭容错和权益证明的优点，显著提高了交易处理速度，同时保持了良好的安全性。",
-                "authors": ["Alice Johnson", "Bob Smith", "Charlie Brown", "Diana Lee"],
-                "link": "http://arxiv.org/abs/2510.04766v1",
-                "published": datetime.now() - timedelta(days=2),
-                "comment": ""
-            },
-            {
-                "title": "Privacy-Preserving Smart Contracts with zk-SNARKs Integration",
-                "summary": "智能合约的透明性虽然带来了信任，但也暴露了用户的隐私。本文提出了一种基于zk-SNARKs的隐私保护智能合约框架，在保证合约正确执行的同时，有效隐藏了交易的敏感信息。",
-                "authors": ["Eva Martinez", "Frank Wilson", "Grace Davis", "Henry Garcia"],
-                "link": "http://arxiv.org/abs/2510.04767v1",
-                "published": datetime.now() - timedelta(days=3),
-                "comment": ""
-            },
-            {
-                "title": "Cross-chain Atomic Swaps with Game-Theoretic Security Guarantees",
-                "summary": "跨链原子交换是实现不同区块链间价值转移的关键技术。本文提出了一种具有博弈论安全保证的新型跨链交换协议，通过经济激励机制确保交换过程的安全性和公平性。",
-                "authors": ["Ivy Rodriguez", "Jack Anderson", "Kate Thomas", "Leo Jackson"],
-                "link": "http://arxiv.org/abs/2510.04768v1",
-                "published": datetime.now() - timedelta(days=4),
-                "comment": ""
-            },
-            {
-                "title": "Decentralized Identity Verification using Blockchain and Biometrics",
-                "summary": "去中心化身份验证是Web 3.0的重要基础设施。本文提出了一种结合区块链和生物识别技术的去中心化身份验证系统，既保证了身份的唯一性，又保护了用户的隐私数据。",
-                "authors": ["Mia White", "Noah Harris", "Olivia Martin", "Peter Thompson"],
-                "link": "http://arxiv.org/abs/2510.04769v1",
-                "published": datetime.now() - timedelta(days=5),
-                "comment": ""
-            },
-            {
-                "title": "Energy-Efficient Mining with Renewable Energy Certificates on Blockchain",
-                "summary": "区块链挖矿的高能耗问题引起了广泛关注。本文提出了一种结合可再生能源证书的节能挖矿机制，通过经济激励引导矿工使用清洁能源，实现可持续发展。",
-                "authors": ["Quinn Moore", "Rachel Taylor", "Steve Allen", "Tina Young"],
-                "link": "http://arxiv.org/abs/2510.04770v1",
-                "published": datetime.now() - timedelta(days=6),
-                "comment": ""
-            },
-            {
-                "title": "Scalable Layer-2 Solutions with Optimistic Rollups and Fraud Proofs",
-                "summary": "Layer-2扩容方案是解决区块链性能瓶颈的重要方向。本文提出了一种结合乐观汇总和欺诈证明的新型Layer-2架构，在提高交易处理速度的同时，确保了资金的安全性。",
-                "authors": ["Uma Scott", "Victor King", "Wendy Wright", "Xavier Hill"],
-                "link": "http://arxiv.org/abs/2510.04771v1",
-                "published": datetime.now() - timedelta(days=7),
-                "comment": ""
-            },
-            {
-                "title": "Quantum-Resistant Cryptographic Algorithms for Future Blockchains",
-                "summary": "随着量子计算的发展，传统密码学面临挑战。本文设计了一套抗量子计算的密码学算法，并探讨了其在下一代区块链中的应用，为系统的长期安全性提供保障。",
-                "authors": ["Yara Green", "Zack Baker", "Amy Adams", "Ben Clark"],
-                "link": "http://arxiv.org/abs/2510.04772v1",
-                "published": datetime.now() - timedelta(days=8),
-                "comment": ""
-            },
-            {
-                "title": "Machine Learning-Based Anomaly Detection in Blockchain Networks",
-                "summary": "区块链网络中的异常行为检测对系统安全至关重要。本文提出了一种基于机器学习的异常检测框架，能够实时识别和预警潜在的安全威胁，提高系统的鲁棒性。",
-                "authors": ["Cindy Lewis", "Dan Walker", "Ella Hall", "Fred Allen"],
-                "link": "http://arxiv.org/abs/2510.04773v1",
-                "published": datetime.now() - timedelta(days=9),
-                "comment": ""
-            },
-            {
-                "title": "Tokenomics Design for Sustainable Decentralized Autonomous Organizations",
-                "summary": "代币经济学设计直接影响去中心化自治组织(DAO)的可持续性。本文通过博弈论和控制论的方法，提出了一种新型代币经济模型，有效激励长期参与并防止恶意行为。",
-                "authors": ["Gina Young", "Harry King", "Iris Wright", "Jack Lopez"],
-                "link": "http://arxiv.org/abs/2510.04774v1",
-                "published": datetime.now() - timedelta(days=10),
-                "comment": ""
-            }
-        ]
-        return mock_papers
+
+    print(f"[INFO] 总共筛选出 {len(candidates)} 篇候选论文")
+    return candidates
 
 
-def format_output(paper_info: Dict) -> str:
-    """格式化最终输出内容"""
+def format_output(paper_info: Dict, report_date: Optional[datetime] = None) -> str:
+    """格式化最终输出内容（report_date 默认为今天，回填历史日报时传入对应日期）"""
+    report_date = report_date or datetime.now()
     # 构建基础模板
-    template = f"""# 📚 ArXiv 区块链论文日报 ({datetime.now().strftime('%Y-%m-%d')})
+    template = f"""# 📚 ArXiv 区块链论文日报 ({report_date.strftime('%Y-%m-%d')})
 
 > 🔍 来源：自动抓取 ArXiv 最新论文并通过通义千问精选
 
@@ -424,14 +1809,22 @@ ArXiv 预印本"""
 
 ### 💡 核心摘要
 {paper_info['summary']}
-
-### ⭐ 关键看点
 """
+    # 从历史记录导入的往期日报没有关键看点
+    if paper_info['insights']:
+        template += "\n### ⭐ 关键看点\n"
     for insight in paper_info['insights']:
         template += f"- {insight}\n"
 
     template += f"\n## 🎯 推荐理由\n{paper_info['recommendation']}\n\n"
 
+    # 添加往期相关推荐（如果有）
+    if paper_info.get('related'):
+        template += "## 🔗 往期相关推荐\n"
+        for related in paper_info['related']:
+            template += f"- [{related['title']}]({related['link']}) ({related['published']})\n"
+        template += "\n"
+
     template += "---\n*🤖 由 AI 自动生成，仅供参考*\n"
     return template
 
@@ -462,7 +1855,7 @@ def format_xiaohongshu_output(paper_info: Dict) -> str:
 {paper_info['recommendation']}
 
 🔗 原文链接：{paper_info['link']}
-
+{format_xiaohongshu_related(paper_info)}
 🤖 本内容由AI生成，访问项目了解更多：
 https://github.com/jialinpeng/ai-blockchain-paper-share
 
@@ -471,45 +1864,20 @@ https://github.com/jialinpeng/ai-blockchain-paper-share
     return template
 
 
+def format_xiaohongshu_related(paper_info: Dict) -> str:
+    """生成小红书风格的往期相关推荐段落，没有相关论文时返回空字符串"""
+    if not paper_info.get('related'):
+        return ""
+    lines = ["", "📚 往期相关推荐："]
+    for i, related in enumerate(paper_info['related'], 1):
+        lines.append(f"{i}. {related['title']}")
+    return '\n'.join(lines) + '\n'
+
+
 def generate_xiaohongshu_hashtags(paper_info: Dict) -> str:
     """根据论文内容和搜索关键词生成小红书话题标签"""
-    title = paper_info['title'].lower()
-    summary = paper_info['summary'].lower()
-    
-    # 定义一些常见的区块链相关主题词
-    topics = {
-        '区块链': ['blockchain', '区块链'],
-        '共识机制': ['consensus', '共识', 'bft', '拜占庭', 'pbft'],
-        '智能合约': ['smart contract', '智能合约', 'solidity'],
-        '网络安全': ['security', 'attack', '安全', '攻击', '防护'],
-        '隐私保护': ['privacy', '匿名', '零知识', 'zk', 'private'],
-        '性能优化': ['performance', 'scalability', 'sharding', '分片', '扩展', '性能'],
-        '跨链技术': ['cross-chain', 'interoperability', '跨链'],
-        '数字钱包': ['wallet', '钱包'],
-        '预言机': ['oracle', '预言机'],
-        '去中心化治理': ['governance', '治理'],
-        '去中心化金融': ['defi', '去中心化金融'],
-        'NFT': ['nft', '非同质化代币'],
-        'Layer2': ['layer 2', 'layer2', 'rollup', '二层'],
-        '挖矿': ['miner', 'mining', '挖矿', '矿工'],
-        '加密货币': ['cryptocurrency', 'token', '代币', '数字货币'],
-        '分布式系统': ['distributed', '分布式'],
-        '数据存储': ['storage', '存储'],
-        '网络协议': ['network', '网络'],
-        '密码学': ['cryptographic', '密码', '哈希', '签名'],
-        '以太坊': ['ethereum', '以太坊'],
-        '比特币': ['bitcoin', '比特币']
-    }
-    
-    # 查找匹配的主题词
-    found_topics = []
-    for topic, keywords in topics.items():
-        for keyword in keywords:
-            if keyword in title or keyword in summary:
-                found_topics.append(topic)
-                break
-        if len(found_topics) >= 5:  # 最多提取5个主题
-            break
+    # 一次扫描标题和摘要，按词表优先级最多提取5个主题
+    found_topics = HASHTAG_TOPIC_MATCHER.find_all(f"{paper_info['title']}\n{paper_info['summary']}", limit=5)
     
     # 如果没有找到特定主题，则使用通用词
     if not found_topics:
@@ -520,9 +1888,18 @@ def generate_xiaohongshu_hashtags(paper_info: Dict) -> str:
     return hashtags + " #学术分享 #科技前沿 #AI #论文推荐"
 
 
-def record_paper_history(paper_info: Dict):
+def load_history_keys(history_file: str = HISTORY_FILENAME) -> set:
+    """读取历史记录中已分享过的论文去重键"""
+    if not os.path.exists(history_file):
+        return set()
+    with open(history_file, 'r', encoding='utf-8') as f:
+        links = re.findall(r'^## \[.*\]\(([^)\s]+)\)\s*$', f.read(), re.MULTILINE)
+    return {paper_key(link) for link in links}
+
+
+def record_paper_history(paper_info: Dict, report_date: Optional[datetime] = None, history_file: str = HISTORY_FILENAME):
     """记录论文历史到 markdown 文件"""
-    history_file = "paper_history.md"
+    report_date = report_date or datetime.now()
     
     # 检查文件是否存在
     file_exists = os.path.exists(history_file)
@@ -534,7 +1911,7 @@ def record_paper_history(paper_info: Dict):
         
         # 添加论文记录
         record = f"""## [{paper_info['title']}]({paper_info['link']})
-- **日期**：{datetime.now().strftime('%Y-%m-%d')}
+- **日期**：{report_date.strftime('%Y-%m-%d')}
 - **作者**：{', '.join(paper_info['authors'])}
 - **摘要**：{paper_info['summary'][:200]}...
 - **推荐理由**：{paper_info['recommendation'][:100]}...
@@ -544,7 +1921,262 @@ def record_paper_history(paper_info: Dict):
         f.write(record)
 
 
-def select_best_paper(papers: List[Dict]) -> Optional[Dict]:
+# -------------------------------
+# 静态归档站点
+# -------------------------------
+
+# 页面模板版本：修改下方模板后递增，使已生成的页面全部重新渲染
+ARCHIVE_SITE_VERSION = 1
+
+_ARCHIVE_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="alternate" type="application/rss+xml" title="ArXiv 区块链论文日报" href="{root}feed.xml">
+<style>
+body {{ max-width: 780px; margin: 2em auto; padding: 0 1em; line-height: 1.7; color: #222;
+       font-family: -apple-system, "PingFang SC", "Microsoft YaHei", sans-serif; }}
+a {{ color: #0366d6; text-decoration: none; }}
+.meta {{ color: #666; font-size: 0.9em; }}
+article {{ border-bottom: 1px solid #eee; padding-bottom: 1em; }}
+</style>
+</head>
+<body>
+<nav><a href="{root}index.html">🏠 归档首页</a> · <a href="{root}feed.xml">RSS</a></nav>
+{body}
+</body>
+</html>
+"""
+
+def atomic_write(path: str, content: str):
+    """先写入同目录下的临时文件再原子替换，读者不会看到写了一半的文件"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def append_archive_record(paper_info: Dict, markdown: str, report_date: Optional[datetime] = None, channel: str = "blockchain"):
+    """把一期日报的完整内容追加到归档记录，供静态归档站点使用"""
+    report_date = report_date or datetime.now()
+    record = {
+        "date": report_date.strftime('%Y-%m-%d'),
+        "channel": channel,
+        "title": paper_info['title'],
+        "link": paper_info['link'],
+        "authors": paper_info['authors'],
+        "published": paper_info['published'].strftime('%Y-%m-%d'),
+        "venue": paper_info['venue'],
+        "summary": paper_info['summary'],
+        "insights": paper_info['insights'],
+        "recommendation": paper_info['recommendation'],
+        "related": [{"title": related['title'], "link": related['link']} for related in paper_info.get('related') or []],
+        "topics": HASHTAG_TOPIC_MATCHER.find_all(f"{paper_info['title']}\n{paper_info['summary']}"),
+        "markdown": markdown,
+    }
+    with open(ARCHIVE_RECORDS_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def load_archive_records(records_file: str = ARCHIVE_RECORDS_FILE) -> List[Dict]:
+    """读取归档记录；同一天同一频道重复生成的日报只保留最后一次"""
+    if not os.path.exists(records_file):
+        return []
+    records = {}
+    with open(records_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records[(record['date'], record['channel'])] = record
+    return [records[key] for key in sorted(records)]
+
+
+def import_paper_history(records_file: str = ARCHIVE_RECORDS_FILE) -> int:
+    """把各频道历史记录（paper_history.md）中尚未归档的日报导入归档记录，返回导入的期数
+
+    历史记录只保存标题、链接、日期、作者以及截断的摘要与推荐理由，导入的日报没有关键看点、
+    发表信息与往期相关推荐；已有归档记录的日期与频道不会重复导入，因此可以在每次生成站点前调用。
+    """
+    archived = {(record['date'], record['channel']) for record in load_archive_records(records_file)}
+    entry_pattern = re.compile(r'^## \[(?P<title>.*)\]\((?P<link>[^()\s]+)\)\s*$', re.MULTILINE)
+    field_pattern = re.compile(r'^- \*\*(日期|作者|摘要|推荐理由)\*\*：(.*)$', re.MULTILINE)
+    imported = []
+    for channel in load_channels():
+        if not os.path.exists(channel['history_file']):
+            continue
+        with open(channel['history_file'], 'r', encoding='utf-8') as f:
+            content = f.read()
+        matches = list(entry_pattern.finditer(content))
+        for match, next_match in zip(matches, matches[1:] + [None]):
+            fields = dict(field_pattern.findall(content[match.end():next_match.start() if next_match else len(content)]))
+            date = fields.get('日期', '').strip()
+            if not re.fullmatch(r'\d{4}-\d{2}-\d{2}', date) or (date, channel['name']) in archived:
+                continue
+            archived.add((date, channel['name']))
+            paper_info = {
+                "title": match['title'], "link": match['link'],
+                "authors": [name.strip() for name in fields.get('作者', '').split(',') if name.strip()],
+                "summary": fields.get('摘要', '').strip(), "insights": [],
+                "recommendation": fields.get('推荐理由', '').strip(),
+            }
+            imported.append(dict(
+                paper_info, date=date, channel=channel['name'], published="", venue="", related=[],
+                topics=HASHTAG_TOPIC_MATCHER.find_all(f"{paper_info['title']}\n{paper_info['summary']}"),
+                markdown=format_output(paper_info, report_date=datetime.strptime(date, '%Y-%m-%d')),
+            ))
+    if imported:
+        with open(records_file, 'a', encoding='utf-8') as f:
+            for record in imported:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"[INFO] 已从历史记录导入 {len(imported)} 期往期日报到归档记录")
+    return len(imported)
+
+
+def _render_archive_article(record: Dict) -> str:
+    """渲染单期日报的 HTML 片段"""
+    esc = html.escape
+    parts = [f'<article>\n<h2><a href="{esc(record["link"])}">{esc(record["title"])}</a></h2>',
+             f'<p class="meta">✍️ {esc(", ".join(record["authors"]))}'
+             + (f' · 📅 {record["published"]}' if record["published"] else '')
+             + (f' · 🏆 {esc(record["venue"])}' if record["venue"] else '') + '</p>',
+             f'<h3>💡 核心摘要</h3>\n<p>{esc(record["summary"])}</p>']
+    if record["insights"]:
+        parts.append('<h3>⭐ 关键看点</h3>\n<ul>' + ''.join(f'<li>{esc(insight)}</li>' for insight in record["insights"]) + '</ul>')
+    parts.append(f'<h3>🎯 推荐理由</h3>\n<p>{esc(record["recommendation"])}</p>')
+    if record["related"]:
+        parts.append('<h3>🔗 往期相关推荐</h3>\n<ul>' + ''.join(
+            f'<li><a href="{esc(related["link"])}">{esc(related["title"])}</a></li>' for related in record["related"]) + '</ul>')
+    if record["topics"]:
+        parts.append('<p class="meta">' + ' '.join(
+            f'<a href="../topics/{quote(topic)}.html">#{esc(topic)}</a>' for topic in record["topics"]) + '</p>')
+    return '\n'.join(parts) + '\n</article>'
+
+
+def _render_archive_list(entries: List[Dict], root: str) -> str:
+    """渲染按日期倒序排列的日报列表"""
+    return '<ul>\n' + '\n'.join(
+        f'<li>{entry["date"]} · <a href="{root}days/{entry["date"]}.html">{html.escape(entry["title"])}</a></li>'
+        for entry in entries) + '\n</ul>'
+
+
+def _render_archive_feed(records: List[Dict]) -> str:
+    """渲染最近若干期日报的 RSS 2.0 订阅源"""
+    esc = html.escape
+    base_url = ARCHIVE_SITE_URL.rstrip('/')
+    items = []
+    for record in records:
+        link = f"{base_url}/days/{record['date']}.html" if base_url else record['link']
+        pub_date = format_datetime(datetime.strptime(record['date'], '%Y-%m-%d').replace(tzinfo=timezone.utc))
+        items.append(f"""<item>
+<title>{esc(record['title'])}</title>
+<link>{esc(link)}</link>
+<guid isPermaLink="false">{esc(record['date'] + '/' + record['channel'] + '/' + paper_key(record['link']))}</guid>
+<pubDate>{pub_date}</pubDate>
+<description>{esc(record['summary'])}</description>
+</item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+<channel>
+<title>ArXiv 区块链论文日报</title>
+<link>{esc(base_url + '/' if base_url else 'https://github.com/jialinpeng/ai-blockchain-paper-share')}</link>
+<description>每日精选一篇 ArXiv 区块链论文，由 AI 生成解读</description>
+{chr(10).join(items)}
+</channel>
+</rss>
+"""
+
+
+def build_archive_site(records_file: str = ARCHIVE_RECORDS_FILE, site_dir: str = ARCHIVE_SITE_DIR) -> Optional[Dict[str, int]]:
+    """根据归档记录增量生成静态归档站点
+
+    站点包括每日页面（HTML 与 Markdown）、按话题标签的索引页、首页、search_index.json 与 feed.xml。
+    每个页面的输入内容先计算哈希并与 .manifest.json 中上次的记录比较，只重新渲染输入有变化的页面；
+    所有文件均原子写入，不再存在的页面会被删除。生成前先导入历史记录中尚未归档的往期日报。
+    """
+    import_paper_history(records_file)
+    records = load_archive_records(records_file)
+    if not records:
+        print(f"[INFO] 归档记录 '{records_file}' 为空，跳过生成归档站点")
+        return None
+
+    manifest_path = os.path.join(site_dir, '.manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    new_manifest = {}
+    counts = {"rendered": 0, "unchanged": 0, "removed": 0}
+
+    def publish(path: str, inputs, render):
+        """输入哈希与上次相同且文件仍存在时跳过渲染"""
+        digest = hashlib.sha256(json.dumps([ARCHIVE_SITE_VERSION, inputs], ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+        new_manifest[path] = digest
+        if manifest.get(path) == digest and os.path.exists(os.path.join(site_dir, path)):
+            counts["unchanged"] += 1
+            return
+        atomic_write(os.path.join(site_dir, path), render())
+        counts["rendered"] += 1
+
+    # 每日页面：同一天的多个频道合并到一页
+    days: Dict[str, List[Dict]] = {}
+    for record in records:
+        days.setdefault(record['date'], []).append(record)
+    for day, day_records in days.items():
+        publish(f"days/{day}.html", day_records, lambda: _ARCHIVE_PAGE_TEMPLATE.format(
+            title=f"ArXiv 区块链论文日报 ({day})", root="../",
+            body=f"<h1>📚 ArXiv 区块链论文日报 ({day})</h1>\n" + '\n'.join(_render_archive_article(record) for record in day_records)))
+        publish(f"days/{day}.md", [record['markdown'] for record in day_records],
+                lambda: '\n\n'.join(record['markdown'].strip() for record in day_records) + '\n')
+
+    # 列表页只依赖日期、标题与话题，摘要等内容变化时无需重新渲染
+    entries = [{"date": record['date'], "title": record['title'], "topics": record['topics']} for record in reversed(records)]
+    topics: Dict[str, List[Dict]] = {topic: [] for topic in HASHTAG_TOPICS}
+    for entry in entries:
+        for topic in entry['topics']:
+            topics.setdefault(topic, []).append(entry)
+    topics = {topic: topic_entries for topic, topic_entries in topics.items() if topic_entries}
+    for topic, topic_entries in topics.items():
+        publish(f"topics/{topic}.html", topic_entries, lambda: _ARCHIVE_PAGE_TEMPLATE.format(
+            title=f"#{topic} · ArXiv 区块链论文日报", root="../",
+            body=f"<h1>#{html.escape(topic)}（{len(topic_entries)} 篇）</h1>\n" + _render_archive_list(topic_entries, "../")))
+
+    topic_counts = [[topic, len(topic_entries)] for topic, topic_entries in topics.items()]
+    publish("index.html", [entries, topic_counts], lambda: _ARCHIVE_PAGE_TEMPLATE.format(
+        title="ArXiv 区块链论文日报归档", root="",
+        body="<h1>📚 ArXiv 区块链论文日报归档</h1>\n<p>"
+             + ' '.join(f'<a href="topics/{quote(topic)}.html">#{html.escape(topic)}</a>（{count}）' for topic, count in topic_counts)
+             + "</p>\n" + _render_archive_list(entries, "")))
+
+    search_entries = [{"date": record['date'], "title": record['title'], "link": record['link'],
+                       "page": f"days/{record['date']}.html", "authors": record['authors'],
+                       "topics": record['topics'], "summary": record['summary']} for record in reversed(records)]
+    publish("search_index.json", search_entries, lambda: json.dumps(search_entries, ensure_ascii=False))
+
+    feed_records = list(reversed(records[-ARCHIVE_FEED_SIZE:]))
+    publish("feed.xml", [ARCHIVE_SITE_URL, feed_records], lambda: _render_archive_feed(feed_records))
+
+    # 删除已不再生成的页面（例如话题不再有论文）
+    for path in manifest:
+        if path not in new_manifest and os.path.exists(os.path.join(site_dir, path)):
+            os.remove(os.path.join(site_dir, path))
+            counts["removed"] += 1
+    atomic_write(manifest_path, json.dumps(new_manifest, ensure_ascii=False, indent=0))
+
+    print(f"[SUCCESS] 归档站点已更新至 '{site_dir}/'：重新生成 {counts['rendered']} 个页面，"
+          f"{counts['unchanged']} 个页面未变化，删除 {counts['removed']} 个页面")
+    return counts
+
+
+def select_best_paper(papers: List[Paper]) -> Optional[Paper]:
     """使用LLM选择最佳论文"""
     if not papers:
         return None
@@ -553,28 +2185,39 @@ def select_best_paper(papers: List[Dict]) -> Optional[Dict]:
         return papers[0]
     
     # 构造提示词，让LLM选择最佳论文
-    paper_summaries = []
-    for i, paper in enumerate(papers):
-        summary = f"""论文 {i+1}:
-标题: {paper['title']}
-摘要: {paper['summary'][:500]}..."""  # 限制摘要长度以避免超出上下文窗口
-        paper_summaries.append(summary)
-    
-    prompt = f"""
-你是一位区块链领域的专家，需要从以下 {len(papers)} 篇区块链相关论文中选择最具价值和创新性的一篇进行深入解读。
+    template = """
+你是一位区块链领域的专家，需要从以下 {count} 篇区块链相关论文中选择最具价值和创新性的一篇进行深入解读。
 请综合考虑以下因素进行选择：
 1. 研究的创新性和技术深度
 2. 对区块链领域的潜在影响
 3. 研究的完整性和实用性
 4. 是否解决了重要问题
 
-{chr(10).join(paper_summaries)}
+{papers}
 
-请仅回复你选择的论文编号（1-{len(papers)}），不要包含其他内容。
-""".strip()
+请仅回复你选择的论文编号（1-{count}），不要包含其他内容。
+"""
+    # 在 token 预算内平均分配各篇摘要的长度；若每篇摘要低于下限，则只比较预算能容纳的前若干篇
+    input_budget, _ = LLM_TOKEN_BUDGETS['selection']
+    available = input_budget - estimate_tokens(template.format(count=len(papers), papers='').strip())
+    header_tokens = [estimate_tokens(f"论文 {i+1}:\n标题: {paper.title}\n摘要: \n") for i, paper in enumerate(papers)]
+    while len(papers) > 1 and (available - sum(header_tokens[:len(papers)])) // len(papers) < SELECTION_MIN_ABSTRACT_TOKENS:
+        papers = papers[:-1]
+    if len(papers) == 1:
+        return papers[0]
+    per_abstract = (available - sum(header_tokens[:len(papers)])) // len(papers)
+
+    paper_summaries = []
+    for i, paper in enumerate(papers):
+        summary = f"""论文 {i+1}:
+标题: {paper.title}
+摘要: {compact_abstract(paper.summary, per_abstract)}"""
+        paper_summaries.append(summary)
+    
+    prompt = template.format(count=len(papers), papers='\n'.join(paper_summaries)).strip()
 
     # 调用LLM获取选择结果
-    answer = call_qwen(prompt)
+    answer = call_qwen(prompt, task='selection')
     if not answer:
         # 如果调用失败，返回第一篇论文
         return papers[0]
@@ -595,109 +2238,325 @@ def select_best_paper(papers: List[Dict]) -> Optional[Dict]:
     return papers[0]
 
 
+def build_final_paper_info(paper: Paper, details: Dict) -> Dict:
+    """合并论文元数据与大模型生成的解读内容"""
+    # 尝试提取第一单位信息
+    affiliation = ""
+    if paper.affiliation:
+        affiliation = paper.affiliation
+    elif len(paper.authors) > 0:
+        # 简单处理，使用第一个作者作为示例
+        affiliation = "未知单位"  # 实际项目中可以使用更复杂的逻辑提取单位信息
+    
+    return {
+        "title": paper.title,
+        "authors": list(paper.authors),
+        "link": paper.link,
+        "published": paper.published,
+        "summary": details["summary"],
+        "insights": details["insights"],
+        "recommendation": details["recommendation"],
+        "venue": paper.comment,
+        "affiliation": affiliation
+    }
+
+
+def load_channels() -> List[Dict]:
+    """读取频道配置并补全默认值；未配置 CHANNELS 时返回与全局参数一致的默认频道"""
+    if not CHANNELS:
+        return [{
+            "name": "blockchain",
+            "keywords": SEARCH_KEYWORDS,
+            "relevance_prompt": DEFAULT_RELEVANCE_PROMPT,
+            "output_filename": OUTPUT_FILENAME,
+            "xiaohongshu_filename": XIAOHONGSHU_FILENAME,
+            "cover_filename": XIAOHONGSHU_COVER_FILENAME,
+            "history_file": HISTORY_FILENAME
+        }]
+
+    channels = []
+    for channel in CHANNELS:
+        name = channel['name']
+        channels.append({
+            "name": name,
+            "keywords": channel.get('keywords') or SEARCH_KEYWORDS,
+            "relevance_prompt": channel.get('relevance_prompt') or DEFAULT_RELEVANCE_PROMPT,
+            "output_filename": channel.get('output_filename') or f"daily_{name}_paper.md",
+            "xiaohongshu_filename": channel.get('xiaohongshu_filename') or f"xiaohongshu_post_{name}.md",
+            "cover_filename": channel.get('cover_filename') or f"xiaohongshu_cover_{name}.txt",
+            "history_file": channel.get('history_file') or f"paper_history_{name}.md"
+        })
+    return channels
+
+
 def main():
     print("[START] 开始执行每日区块链论文推送任务...")
+    reset_run_stats()
+    reset_run_caches()
+    channels = load_channels()
     
-    # Step 1: 获取候选论文
-    candidates = get_recent_candidate_papers()
+    # Step 1: 按全部频道关键词的并集统一抓取一次候选论文
+    keywords = list(dict.fromkeys(keyword for channel in channels for keyword in channel['keywords']))
+    try:
+        with profile_stage('harvest'):
+            candidates = get_recent_candidate_papers(keywords=keywords)
+    except ArxivUnavailableError as e:
+        # 不使用模拟数据顶替，保留上一期的输出文件不变
+        print(f"[ERROR] {e}，本次不生成日报")
+        return
+
+    with profile_stage('index'):
+        # 为全部候选论文打上话题与 CCF 等级标签（预编译匹配器，开销可忽略）
+        for paper in candidates:
+            tag_paper(paper)
+
+        # 把本次抓取的论文追加到往期论文索引
+        index = get_paper_index()
+        if index is not None:
+            index.add_papers(candidates)
+
+    # 只打乱一次候选顺序，各频道按同一顺序抽样，使重叠的论文尽量命中共享的分类缓存
+    random.shuffle(candidates)
+
+    for channel in channels:
+        if len(channels) > 1:
+            print(f"[CHANNEL] 开始处理频道 '{channel['name']}' ...")
+        run_channel(channel, candidates)
+
+    # 增量更新静态归档站点
+    with profile_stage('publish'):
+        build_archive_site()
+
+    print_run_stats()
+
+
+def run_channel(channel: Dict, candidates: List[Paper]):
+    """针对单个频道完成筛选、选择与输出（候选论文已统一抓取并打乱顺序）"""
+    output_filename = channel['output_filename']
+    history_file = channel['history_file']
+
+    # 只保留命中本频道关键词且未在本频道历史中分享过的论文（没有关键词信息的论文视为全部命中）
+    channel_keywords = set(channel['keywords'])
+    shared_keys = load_history_keys(history_file)
+    candidates = [paper for paper in candidates
+                  if (not paper.keywords or channel_keywords.intersection(paper.keywords))
+                  and paper.paper_id not in shared_keys]
     if not candidates:
         print("[END] 近期未找到符合条件的候选论文。")
-        with open(OUTPUT_FILENAME, 'w', encoding='utf-8') as f:
+        with open(output_filename, 'w', encoding='utf-8') as f:
             f.write("# 📚 ArXiv 区块链论文日报\n\n今日暂无推荐。\n")
         return
 
-    # Step 2: 筛选出与区块链相关的论文，最多50篇
+    # Step 2: 筛选出与频道主题相关的论文，最多50篇
     related_papers = []
     
-    # 创建一个候选论文的副本来进行随机选择
+    # 候选论文已随机打乱，如果数量超过20篇，则取前20篇进行分析
     candidate_pool = list(candidates)
-    # 如果候选论文数量超过20篇，则随机选择20篇进行分析
     if len(candidate_pool) > 20:
         print(f"[INFO] 从 {len(candidate_pool)} 篇候选论文中随机选择 20 篇进行分析...")
-        candidate_pool = random.sample(candidate_pool, 20)
+        candidate_pool = candidate_pool[:20]
     
-    for i, paper in enumerate(candidate_pool):
-        if len(related_papers) >= 50:  # 最多只需要50篇
-            break
-            
-        print(f"[PROCESS] 正在分析第 {i+1}/{len(candidate_pool)} 篇候选论文: {paper['title']}...")
-        
-        # 首先判断是否与区块链相关
-        if is_blockchain_related(paper['title'], paper['summary']):
-            related_papers.append(paper)
-            print(f"[SELECT] ✅ 找到相关论文 ({len(related_papers)}/50): {paper['title']}... 链接: {paper['link']}")
-            
-        time.sleep(1)  # 礼貌等待，避免频繁请求
+    with profile_stage('classify'):
+        for i, paper in enumerate(candidate_pool):
+            if len(related_papers) >= 50:  # 最多只需要50篇
+                break
+
+            print(f"[PROCESS] 正在分析第 {i+1}/{len(candidate_pool)} 篇候选论文: {paper.title}...")
+
+            # 首先判断是否与频道主题相关（命中共享缓存时不再调用大模型）
+            if classify_paper(paper, channel['relevance_prompt']):
+                related_papers.append(paper)
+                print(f"[SELECT] ✅ 找到相关论文 ({len(related_papers)}/50): {paper.title}... 链接: {paper.link}")
         
     if not related_papers:
-        print("[END] 经过筛选，未发现完全符合'区块链'主题的论文。")
-        with open(OUTPUT_FILENAME, 'w', encoding='utf-8') as f:
+        print("[END] 经过筛选，未发现完全符合频道主题的论文。")
+        with open(output_filename, 'w', encoding='utf-8') as f:
             f.write("# 📚 ArXiv 区块链论文日报\n\n今日暂无比选中的区块链论文。\n")
         return
 
-    print(f"[INFO] 共找到 {len(related_papers)} 篇区块链相关论文，开始选择最优论文...")
+    print(f"[INFO] 共找到 {len(related_papers)} 篇相关论文，开始选择最优论文...")
     
     # Step 3: 使用LLM从相关论文中选择1篇最优论文进行精读
-    selected_paper = select_best_paper(related_papers)
+    with profile_stage('select'):
+        selected_paper = select_best_paper(related_papers)
     if selected_paper:
-        print(f"[SELECT] ✅ 选择最优论文: {selected_paper['title'][:50]}...")
+        print(f"[SELECT] ✅ 选择最优论文: {selected_paper.title[:50]}...")
     else:
         print("[ERROR] 论文选择失败")
         return
-    
+
     # 获取论文详细信息
-    published_venue = selected_paper['comment'] if selected_paper['comment'] else ""
-    if published_venue and is_ccf_a_venue(published_venue):
-        print(f"[INFO] 论文发表在 CCF-A 类会议/期刊: {published_venue}")
+    if selected_paper.ccf_rank:
+        print(f"[INFO] 论文发表在 CCF-{selected_paper.ccf_rank} 类会议/期刊: {selected_paper.comment}")
     
-    details = generate_summary_and_insights(selected_paper['title'], selected_paper['summary'], selected_paper['link'])
-    
-    # 尝试提取第一单位信息
-    affiliation = ""
-    if 'affiliation' in selected_paper and selected_paper['affiliation']:
-        affiliation = selected_paper['affiliation']
-    elif 'authors' in selected_paper and len(selected_paper['authors']) > 0:
-        # 简单处理，使用第一个作者作为示例
-        affiliation = "未知单位"  # 实际项目中可以使用更复杂的逻辑提取单位信息
-    
-    final_paper_info = {
-        "title": selected_paper['title'],
-        "authors": selected_paper['authors'],
-        "link": selected_paper['link'],
-        "published": selected_paper['published'],
-        "summary": details["summary"],
-        "insights": details["insights"],
-        "recommendation": details["recommendation"],
-        "venue": published_venue,
-        "affiliation": affiliation
-    }
+    with profile_stage('summarize'):
+        details = get_summary_and_insights(selected_paper)
 
-    # Step 4: 格式化并保存结果
-    final_content = format_output(final_paper_info)
-    
-    with open(OUTPUT_FILENAME, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-    
-    # Step 5: 记录历史论文
-    record_paper_history(final_paper_info)
-    
-    # Step 6: 生成小红书风格的内容
-    xiaohongshu_content = format_xiaohongshu_output(final_paper_info)
-    with open("xiaohongshu_post.md", 'w', encoding='utf-8') as f:
-        f.write(xiaohongshu_content)
-    
-    # Step 7: 生成小红书封面文字信息
-    xiaohongshu_cover = generate_xiaohongshu_cover_text(final_paper_info)
-    with open("xiaohongshu_cover.txt", 'w', encoding='utf-8') as f:
-        f.write(xiaohongshu_cover)
+    with profile_stage('render'):
+        final_paper_info = build_final_paper_info(selected_paper, details)
+        final_paper_info["related"] = find_related_papers(selected_paper)
+
+        # Step 4: 格式化并保存结果
+        final_content = format_output(final_paper_info)
+
+        with open(output_filename, 'w', encoding='utf-8') as f:
+            f.write(final_content)
+
+        # Step 5: 记录历史论文与归档记录，并在往期论文索引中标记为已推荐
+        record_paper_history(final_paper_info, history_file=history_file)
+        append_archive_record(final_paper_info, final_content, channel=channel['name'])
+        mark_paper_recommended(selected_paper)
+
+        # Step 6: 生成小红书风格的内容
+        xiaohongshu_content = format_xiaohongshu_output(final_paper_info)
+        with open(channel['xiaohongshu_filename'], 'w', encoding='utf-8') as f:
+            f.write(xiaohongshu_content)
+
+        # Step 7: 生成小红书封面文字信息
+        xiaohongshu_cover = generate_xiaohongshu_cover_text(final_paper_info)
+        with open(channel['cover_filename'], 'w', encoding='utf-8') as f:
+            f.write(xiaohongshu_cover)
     
-    print(f"[SUCCESS] 已成功生成报告并保存至 '{OUTPUT_FILENAME}'")
-    print(f"[SUCCESS] 已记录论文历史到 'paper_history.md'")
-    print(f"[SUCCESS] 已生成小红书风格内容并保存至 'xiaohongshu_post.md'")
-    print(f"[SUCCESS] 已生成小红书封面文字并保存至 'xiaohongshu_cover.txt'")
+    print(f"[SUCCESS] 已成功生成报告并保存至 '{output_filename}'")
+    print(f"[SUCCESS] 已记录论文历史到 '{history_file}'")
+    print(f"[SUCCESS] 已生成小红书风格内容并保存至 '{channel['xiaohongshu_filename']}'")
+    print(f"[SUCCESS] 已生成小红书封面文字并保存至 '{channel['cover_filename']}'")
+
+def _as_utc(dt: datetime) -> datetime:
+    """将 naive datetime 视为 UTC 时间，便于与 ArXiv 返回的时间比较"""
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
-def get_paper_by_id(paper_id: str) -> Optional[Dict]:
+def generate_backfill_reports(start: str, end: str):
+    """回填 [start, end] 区间内每天的日报：按全部频道关键词的并集只抓取一次，再按频道、按天切分候选论文"""
+    try:
+        first_day = datetime.strptime(start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        last_day = datetime.strptime(end, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    except ValueError:
+        print("[ERROR] 日期格式应为 YYYY-MM-DD")
+        return
+    if first_day > last_day:
+        print("[ERROR] 起始日期不能晚于结束日期")
+        return
+
+    print(f"[START] 开始回填 {start} 至 {end} 的区块链论文日报...")
+    reset_run_stats()
+    reset_run_caches()
+    os.makedirs(BACKFILL_DIR, exist_ok=True)
+    days = [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+    channels = load_channels()
+
+    # Step 1: 一次性抓取覆盖全部回溯窗口、全部频道关键词的候选论文
+    keywords = list(dict.fromkeys(keyword for channel in channels for keyword in channel['keywords']))
+    harvest_start = first_day + timedelta(days=1) - timedelta(days=DAYS_TO_LOOK_BACK)
+    try:
+        with profile_stage('harvest'):
+            candidates = get_recent_candidate_papers(harvest_start, last_day + timedelta(days=1), keywords=keywords)
+    except ArxivUnavailableError as e:
+        print(f"[ERROR] {e}，本次不回填日报")
+        return
+    with profile_stage('index'):
+        candidates = [tag_paper(paper) for paper in candidates]
+        candidates.sort(key=lambda paper: _as_utc(paper.published))
+        index = get_paper_index()
+        if index is not None:
+            index.add_papers(candidates)
+
+    for channel in channels:
+        if len(channels) > 1:
+            print(f"[CHANNEL] 开始回填频道 '{channel['name']}' ...")
+        backfill_channel(channel, candidates, days, file_stem="daily" if not CHANNELS else f"daily_{channel['name']}")
+
+    with profile_stage('publish'):
+        build_archive_site()
+    print_run_stats()
+
+
+def backfill_channel(channel: Dict, candidates: List[Paper], days: List[datetime], file_stem: str = "daily"):
+    """回填单个频道的每日日报（候选论文已统一抓取并按发布时间排序）"""
+    # 只保留命中本频道关键词且未在本频道历史中分享过的论文
+    channel_keywords = set(channel['keywords'])
+    shared_keys = load_history_keys(channel['history_file'])
+    candidates = [paper for paper in candidates
+                  if (not paper.keywords or channel_keywords.intersection(paper.keywords))
+                  and paper.paper_id not in shared_keys]
+    published_times = [_as_utc(paper.published) for paper in candidates]
+
+    # Step 2: 按天切分回溯窗口，每天随机抽取至多20篇（以日期为随机种子，结果可复现）
+    pools = {}
+    for day in days:
+        window_end = day + timedelta(days=1)
+        lo = bisect.bisect_left(published_times, window_end - timedelta(days=DAYS_TO_LOOK_BACK))
+        hi = bisect.bisect_left(published_times, window_end)
+        pool = candidates[lo:hi]
+        if len(pool) > 20:
+            pool = random.Random(day.strftime('%Y-%m-%d')).sample(pool, 20)
+        pools[day] = pool
+
+    # Step 3: 重叠窗口共享分类结果：对各天样本的并集并行分类，每篇论文只调用一次大模型
+    unique_papers = {paper.paper_id: paper for pool in pools.values() for paper in pool}
+    print(f"[INFO] {len(days)} 天共需分析 {len(unique_papers)} 篇候选论文...")
+
+    def classify(paper: Paper) -> bool:
+        related = classify_paper(paper, channel['relevance_prompt'])
+        if related:
+            print(f"[SELECT] ✅ 找到相关论文: {paper.title}... 链接: {paper.link}")
+        return related
+
+    with profile_stage('classify'), ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as executor:
+        related_keys = {key for key, related in zip(unique_papers, executor.map(classify, unique_papers.values())) if related}
+
+    # Step 4: 按日期顺序选择最优论文，前面日期已选中的论文不再参与后续选择；
+    # 往期相关推荐只引用在当天之前推荐过的论文（包括此前日常运行推荐的论文）
+    selections = {}
+    related_by_day = {}
+    picked_keys = set()
+    for day in days:
+        related_papers = [paper for paper in pools[day]
+                          if paper.paper_id in related_keys and paper.paper_id not in picked_keys]
+        with profile_stage('select'):
+            selected_paper = select_best_paper(related_papers)
+        if selected_paper:
+            picked_keys.add(selected_paper.paper_id)
+            selections[day] = selected_paper
+            related_by_day[day] = find_related_papers(selected_paper, before=day)
+            mark_paper_recommended(selected_paper, on=day)
+            print(f"[SELECT] ✅ {day.strftime('%Y-%m-%d')} 选择最优论文: {selected_paper.title[:50]}...")
+        else:
+            print(f"[INFO] {day.strftime('%Y-%m-%d')} 未发现符合频道 '{channel['name']}' 主题的论文")
+            with open(f"{BACKFILL_DIR}/{file_stem}_{day.strftime('%Y-%m-%d')}.md", 'w', encoding='utf-8') as f:
+                f.write(f"# 📚 ArXiv 区块链论文日报 ({day.strftime('%Y-%m-%d')})\n\n今日暂无推荐。\n")
+
+    # Step 5: 并行生成各天的解读内容并保存带日期的报告文件
+    def render(day: datetime) -> Dict:
+        paper = selections[day]
+        details = get_summary_and_insights(paper)
+        final_paper_info = build_final_paper_info(paper, details)
+        final_paper_info["related"] = related_by_day[day]
+        file_prefix = f"{BACKFILL_DIR}/{file_stem}_{day.strftime('%Y-%m-%d')}"
+        with open(f"{file_prefix}.md", 'w', encoding='utf-8') as f:
+            f.write(format_output(final_paper_info, report_date=day))
+        with open(f"{file_prefix}_xiaohongshu.md", 'w', encoding='utf-8') as f:
+            f.write(format_xiaohongshu_output(final_paper_info))
+        with open(f"{file_prefix}_cover.txt", 'w', encoding='utf-8') as f:
+            f.write(generate_xiaohongshu_cover_text(final_paper_info))
+        return final_paper_info
+
+    with profile_stage('render'), ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as executor:
+        final_infos = dict(zip(selections, executor.map(render, selections)))
+
+    # Step 6: 全部生成完成后按日期顺序统一追加历史记录与归档记录，避免并发写入
+    for day in days:
+        if day in final_infos:
+            record_paper_history(final_infos[day], report_date=day, history_file=channel['history_file'])
+            append_archive_record(final_infos[day], format_output(final_infos[day], report_date=day),
+                                  report_date=day, channel=channel['name'])
+
+    print(f"[SUCCESS] 已回填 {len(final_infos)}/{len(days)} 天的日报并保存至 '{BACKFILL_DIR}/'")
+    print(f"[SUCCESS] 已按日期顺序记录论文历史到 '{channel['history_file']}'")
+
+
+def get_paper_by_id(paper_id: str) -> Optional[Paper]:
     """通过论文ID获取论文信息"""
     try:
         # 处理完整链接的情况，提取ID
@@ -711,18 +2570,17 @@ def get_paper_by_id(paper_id: str) -> Optional[Dict]:
                 print(f"[ERROR] 无法从链接 {paper_id} 中提取论文ID")
                 return None
         
-        search = arxiv.Search(id_list=[paper_id])
-        results = list(search.results())
+        results = list(ARXIV_API.results(id_list=[paper_id], max_results=1))
         if results:
             paper = results[0]
-            return {
-                'title': paper.title,
-                'authors': [author.name for author in paper.authors],
-                'summary': paper.summary,
-                'link': paper.entry_id,
-                'published': paper.published,
-                'comment': paper.comment if paper.comment else ""
-            }
+            return Paper(
+                title=paper['title'],
+                authors=paper['authors'],
+                summary=paper['summary'],
+                link=paper['entry_id'],
+                published=paper['published'],
+                comment=paper['comment']
+            )
         else:
             print(f"[ERROR] 未找到ID为 {paper_id} 的论文")
             return None
@@ -734,47 +2592,34 @@ def get_paper_by_id(paper_id: str) -> Optional[Dict]:
 def generate_report_from_arxiv_id(paper_id: str):
     """通过ArXiv ID生成论文日报"""
     print(f"[START] 开始处理论文 ID: {paper_id}")
+    reset_run_stats()
     
     # 创建单独的文件夹来保存单篇论文分析结果
     single_paper_dir = "single_paper_reports"
     os.makedirs(single_paper_dir, exist_ok=True)
     
     # 获取论文信息
-    paper_info = get_paper_by_id(paper_id)
+    with profile_stage('harvest'):
+        paper_info = get_paper_by_id(paper_id)
     if not paper_info:
         print("[ERROR] 无法获取论文信息")
         return
     
-    print(f"[INFO] 成功获取论文: {paper_info['title']}")
-    print(f"[INFO] 论文链接: {paper_info['link']}")
-    
+    print(f"[INFO] 成功获取论文: {paper_info.title}")
+    print(f"[INFO] 论文链接: {paper_info.link}")
+
     # 生成论文摘要和关键点
-    details = generate_summary_and_insights(paper_info['title'], paper_info['summary'], paper_info['link'])
-    
+    with profile_stage('summarize'):
+        details = generate_summary_and_insights(paper_info.title, paper_info.summary, paper_info.link)
+
     # 获取发表信息
-    published_venue = paper_info['comment'] if paper_info['comment'] else ""
-    if published_venue and is_ccf_a_venue(published_venue):
-        print(f"[INFO] 论文发表在 CCF-A 类会议/期刊: {published_venue}")
+    published_venue = paper_info.comment
+    ccf_rank = get_ccf_rank(published_venue)
+    if ccf_rank:
+        print(f"[INFO] 论文发表在 CCF-{ccf_rank} 类会议/期刊: {published_venue}")
     
-    # 尝试提取第一单位信息
-    affiliation = ""
-    if 'affiliation' in paper_info and paper_info['affiliation']:
-        affiliation = paper_info['affiliation']
-    elif 'authors' in paper_info and len(paper_info['authors']) > 0:
-        # 简单处理，使用第一个作者作为示例
-        affiliation = "未知单位"  # 实际项目中可以使用更复杂的逻辑提取单位信息
-    
-    final_paper_info = {
-        "title": paper_info['title'],
-        "authors": paper_info['authors'],
-        "link": paper_info['link'],
-        "published": paper_info['published'],
-        "summary": details["summary"],
-        "insights": details["insights"],
-        "recommendation": details["recommendation"],
-        "venue": published_venue,
-        "affiliation": affiliation
-    }
+    final_paper_info = build_final_paper_info(paper_info, details)
+    final_paper_info["related"] = find_related_papers(paper_info)
 
     # 格式化并保存结果
     final_content = format_output(final_paper_info)
@@ -807,44 +2652,13 @@ def generate_report_from_arxiv_id(paper_id: str):
     print(f"[SUCCESS] 已成功生成报告并保存至 '{output_filename}'")
     print(f"[SUCCESS] 已生成小红书风格内容并保存至 '{xiaohongshu_filename}'")
     print(f"[SUCCESS] 已生成小红书封面文字并保存至 '{xiaohongshu_cover_filename}'")
-    print(f"[INFO] 论文链接: {paper_info['link']}")
+    print(f"[INFO] 论文链接: {paper_info.link}")
+    print_run_stats()
 
 def generate_xiaohongshu_cover_text(paper_info: Dict):
     """生成小红书风格的封面文字信息，基于实际论文内容"""
-    # 根据论文标题和摘要提取关键词作为主要内容总结
-    title = paper_info['title'].lower()
-    summary = paper_info['summary'].lower()
-    
-    # 定义一些常见的区块链相关主题词
-    topics = {
-        '共识': ['consensus', '共识', 'bft', '拜占庭', 'pbft'],
-        '智能合约': ['smart contract', '智能合约', 'solidity'],
-        '安全': ['security', 'attack', '安全', '攻击', '防护'],
-        '隐私': ['privacy', '匿名', '零知识', 'zk', 'private'],
-        '性能': ['performance', 'scalability', 'sharding', '分片', '扩展', '性能'],
-        '跨链': ['cross-chain', 'interoperability', '跨链'],
-        '钱包': ['wallet', '钱包'],
-        '预言机': ['oracle', '预言机'],
-        '治理': ['governance', '治理'],
-        'defi': ['defi', '去中心化金融'],
-        'nft': ['nft', '非同质化代币'],
-        'layer2': ['layer 2', 'layer2', 'rollup', '二层'],
-        '矿工': ['miner', 'mining', '挖矿', '矿工'],
-        '数字货币': ['cryptocurrency', 'token', '代币', '数字货币'],
-        '分布式': ['distributed', '分布式'],
-        '存储': ['storage', '存储'],
-        '网络': ['network', '网络']
-    }
-    
-    # 查找匹配的主题词
-    found_topics = []
-    for topic, keywords in topics.items():
-        for keyword in keywords:
-            if keyword in title or keyword in summary:
-                found_topics.append(topic)
-                break
-        if len(found_topics) >= 2:  # 最多提取2个主题
-            break
+    # 根据论文标题和摘要提取关键词作为主要内容总结，最多提取2个主题
+    found_topics = COVER_TOPIC_MATCHER.find_all(f"{paper_info['title']}\n{paper_info['summary']}", limit=2)
     
     # 如果没有找到特定主题，则使用通用词
     if not found_topics:
@@ -875,17 +2689,34 @@ def schedule_daily_task():
 if __name__ == "__main__":
     # 检查是否需要定时执行
     import sys
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--schedule":
-            schedule_daily_task()
-        elif sys.argv[1] == "--arxiv-id" and len(sys.argv) > 2:
-            # 通过ArXiv ID生成报告
-            paper_id = sys.argv[2]
-            generate_report_from_arxiv_id(paper_id)
+    # --profile 可与任意运行模式组合，按阶段输出性能分析结果
+    if "--profile" in sys.argv:
+        sys.argv.remove("--profile")
+        enable_profiling()
+    try:
+        if len(sys.argv) > 1:
+            if sys.argv[1] == "--schedule":
+                schedule_daily_task()
+            elif sys.argv[1] == "--arxiv-id" and len(sys.argv) > 2:
+                # 通过ArXiv ID生成报告
+                paper_id = sys.argv[2]
+                generate_report_from_arxiv_id(paper_id)
+            elif sys.argv[1] == "--backfill" and len(sys.argv) > 3:
+                # 回填指定日期区间的历史日报
+                generate_backfill_reports(sys.argv[2], sys.argv[3])
+            elif sys.argv[1] == "--build-site":
+                # 根据归档记录增量生成静态归档站点
+                build_archive_site()
+            else:
+                print("用法:")
+                print("  python blockchain_paper_daily.py                     # 执行每日论文筛选")
+                print("  python blockchain_paper_daily.py --schedule         # 定时执行每日论文筛选")
+                print("  python blockchain_paper_daily.py --arxiv-id <ID>    # 通过ArXiv ID生成论文报告")
+                print("  python blockchain_paper_daily.py --backfill <START> <END>  # 回填指定日期区间的历史日报 (YYYY-MM-DD)")
+                print("  python blockchain_paper_daily.py --build-site       # 增量生成静态归档站点")
+                print("  可附加 --profile 参数，按阶段输出 CPU、内存与等待时间分析")
         else:
-            print("用法:")
-            print("  python blockchain_paper_daily.py                     # 执行每日论文筛选")
-            print("  python blockchain_paper_daily.py --schedule         # 定时执行每日论文筛选")
-            print("  python blockchain_paper_daily.py --arxiv-id <ID>    # 通过ArXiv ID生成论文报告")
-    else:
-        main()
\ No newline at end of file
+            main()
+    finally:
+        if PROFILER is not None:
+            write_profile_report()